@@ -3,37 +3,98 @@ def delete_career_file(career_name: str, db_folder: str = '.') -> bool:
     Deletes the career database file for the given career name.
     Returns True if deleted, False if not found.
     """
-    safe_name = career_name.replace(' ', '_')
-    db_name = f"career_{safe_name}.db"
-    db_path = os.path.join(db_folder, db_name)
+    return delete_career_slot(career_db_path(career_name, db_folder))
+
+
+def delete_career_slot(db_path: str) -> bool:
+    """Deletes the save slot file at db_path. Returns True if deleted, False if not found."""
     if os.path.exists(db_path):
-        os.remove(db_path)
+        connection_pool.release(db_path)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
         return True
     return False
-import shutil
 import os
+import sqlite3
+from typing import List, Tuple
+
+from cs2_database import CS2Database, connection_pool
+
+
+def career_db_path(career_name: str, db_folder: str = '.') -> str:
+    """Path of the save slot for a career"""
+    safe_name = career_name.replace(' ', '_')
+    return os.path.join(db_folder, f"career_{safe_name}.db")
+
 
 def create_career_database(career_name: str, base_db_path: str = 'cs2_simulator.db', db_folder: str = '.') -> str:
     """
-    Copies the base database and renames it for the career save.
-    Returns the path to the new career database.
+    Creates an empty save slot for the career and returns its path.
+    The slot only holds the career's own tables and roster changes; teams,
+    players and roles are read from base_db_path (see attach_base), so
+    creating one costs the same whatever the size of the base database.
     """
-    safe_name = career_name.replace(' ', '_')
-    new_db_name = f"career_{safe_name}.db"
-    new_db_path = os.path.join(db_folder, new_db_name)
-    shutil.copy2(base_db_path, new_db_path)
-
-    # Clean up career_players, careers and career_matches tables in the new DB
-    import sqlite3
-    conn = sqlite3.connect(new_db_path)
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM career_players')
-    cursor.execute('DELETE FROM careers')
-    cursor.execute('DELETE FROM career_matches')
-    conn.commit()
-    conn.close()
+    new_db_path = career_db_path(career_name, db_folder)
+    delete_career_file(career_name, db_folder)
+    # Slots overlay the base schema, so it has to be current first
+    CS2Database(base_db_path)
+    CS2Database(new_db_path, base_db_path=base_db_path)
     return new_db_path
 
+
+def open_career_database(career_name: str, base_db_path: str = 'cs2_simulator.db', db_folder: str = '.') -> CS2Database:
+    """Open a career's save slot layered over the base database"""
+    return open_career_slot(career_db_path(career_name, db_folder), base_db_path)
+
+
+def open_career_slot(db_path: str, base_db_path: str = 'cs2_simulator.db') -> CS2Database:
+    """Open the save slot at db_path layered over the base database"""
+    if _is_full_copy(db_path):
+        # Older saves are full copies of the base database and are used as they are
+        return CS2Database(db_path)
+    return CS2Database(db_path, base_db_path=base_db_path)
+
+
+def _is_full_copy(db_path: str) -> bool:
+    """Whether db_path has teams of its own, looked up on a fresh connection.
+
+    A pooled connection may already have the base attached, and "teams"
+    would then resolve to the base's view.
+    """
+    if not os.path.exists(db_path):
+        return False
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute('SELECT 1 FROM main.teams LIMIT 1').fetchone() is not None
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def _slot_player_name(db_path: str) -> str:
+    """Player name of the career in a slot, or one derived from the file name"""
+    fallback = os.path.basename(db_path)[len("career_"):-len(".db")].replace('_', ' ')
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return fallback
+    try:
+        row = conn.execute('SELECT player_name FROM careers LIMIT 1').fetchone()
+        return row[0] if row else fallback
+    except sqlite3.Error:
+        return fallback
+    finally:
+        conn.close()
+
+
+def list_career_databases(db_folder: str = '.') -> List[Tuple[str, str]]:
+    """(player name, path) of every save slot in db_folder, sorted by player name"""
+    paths = [entry.path for entry in os.scandir(db_folder)
+             if entry.name.startswith("career_") and entry.name.endswith(".db") and entry.is_file()]
+    return sorted((_slot_player_name(path), path) for path in paths)
+
 # Example usage:
 # new_db = create_career_database('My Career Save')
 # print(f"Created career DB at: {new_db}")
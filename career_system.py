@@ -1,12 +1,129 @@
 import json
 import os
+import random
+import time
+from bisect import bisect_right
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from cs2_database import CS2Database
-
-class CareerPlayer:
+from cs2_simulator import Team, play_series
+
+XP_FIRST_LEVEL = 100  # experience_to_next at level 1
+XP_GROWTH = 1.2       # Each level needs int(previous * XP_GROWTH), truncated step by step
+MAX_RATING = 100
+
+# Progression tables indexed by level (index 0 unused), extended on demand:
+# experience_to_next at the level, total XP from level 1 to reach it, and
+# total rating gained from level 1 to reach it
+_LEVEL_XP = [0, XP_FIRST_LEVEL]
+_LEVEL_TOTAL_XP = [0, 0]
+_LEVEL_RATING = [0, 0]
+
+
+def level_rating_gain(level: int) -> int:
+    """Rating gained on reaching level (max 5 per level up)"""
+    return min(5, level // 5 + 1)
+
+
+def _extend_level_tables(level: int, total_xp: int):
+    """Grow the tables to cover level and the first level needing more than total_xp"""
+    while len(_LEVEL_XP) <= level or _LEVEL_TOTAL_XP[-1] <= total_xp:
+        _LEVEL_RATING.append(_LEVEL_RATING[-1] + level_rating_gain(len(_LEVEL_XP)))
+        _LEVEL_TOTAL_XP.append(_LEVEL_TOTAL_XP[-1] + _LEVEL_XP[-1])
+        _LEVEL_XP.append(int(_LEVEL_XP[-1] * XP_GROWTH))
+
+
+# Stats achievement rules can depend on
+ACHIEVEMENT_STATS = {
+    "level": lambda p: p.level,
+    "matches_played": lambda p: p.matches_played,
+    "wins": lambda p: p.wins,
+    "total_kills": lambda p: p.total_kills,
+    "total_deaths": lambda p: p.total_deaths,
+    "total_assists": lambda p: p.total_assists,
+    "kdr": lambda p: p.get_kdr(),
+    "win_streak": lambda p: p.win_streak,
+}
+MATCH_STATS = ("matches_played", "wins", "total_kills", "total_deaths", "total_assists", "kdr", "win_streak")
+
+# (name, stat, threshold) as seeded in the achievements table
+DEFAULT_ACHIEVEMENT_RULES = (
+    ("Rising Star", "level", 5),
+    ("Veteran", "matches_played", 10),
+    ("Winner", "wins", 5),
+    ("Killer", "total_kills", 50),
+    ("Sharpshooter", "kdr", 1.5),
+    ("Unstoppable", "win_streak", 10),
+)
+
+
+class AchievementRules:
+    """Achievement rules "stat >= threshold", indexed by stat and sorted by threshold.
+
+    Once a stat reaches a threshold its achievement is unlocked for good, so
+    the unlocked rules of a stat are a prefix of its sorted list. Each player
+    keeps how far into every list it got, and evaluating a stat only looks
+    at the rules past that point.
+    """
+    def __init__(self, rules):
+        self.by_stat = {}
+        for name, stat, threshold in rules:
+            if stat in ACHIEVEMENT_STATS:
+                self.by_stat.setdefault(stat, []).append((threshold, name))
+        for stat_rules in self.by_stat.values():
+            stat_rules.sort(key=lambda rule: rule[0])
+
+    def evaluate(self, player, stats):
+        """Unlock every achievement player now qualifies for among the rules on stats"""
+        progress = player._rule_progress
+        for stat in stats:
+            stat_rules = self.by_stat.get(stat)
+            if not stat_rules:
+                continue
+            index = progress.get(stat, 0)
+            if index == len(stat_rules):
+                continue
+            value = ACHIEVEMENT_STATS[stat](player)
+            while index < len(stat_rules) and value >= stat_rules[index][0]:
+                player.unlock(stat_rules[index][1])
+                index += 1
+            progress[stat] = index
+
+
+DEFAULT_RULES = AchievementRules(DEFAULT_ACHIEVEMENT_RULES)
+
+
+class Persisted:
+    """Remembers the row id and column values last written to each database file.
+
+    Saves compare persisted_state() with what was written and only update
+    the columns that changed (nothing at all when clean).
+    """
+    PERSISTED_FIELDS = ()
+
+    def persisted_state(self) -> Dict:
+        return {field: getattr(self, field) for field in self.PERSISTED_FIELDS}
+
+    def saved_state(self, db_key: str):
+        """(row id, column values) as of the last load or save in db_key, or None"""
+        return self._db_state.get(db_key)
+
+    def mark_saved(self, db_key: str, row_id: int, state: Dict):
+        self._db_state[db_key] = (row_id, state)
+
+    def forget_saved(self, db_key: str):
+        """Drop what is known about db_key, e.g. after a rolled back save; the next save writes everything"""
+        self._db_state.pop(db_key, None)
+
+
+class CareerPlayer(Persisted):
     """Represents a player in career mode"""
+    PERSISTED_FIELDS = ("base_rating", "current_rating", "level", "experience", "experience_to_next",
+                        "matches_played", "wins", "total_kills", "total_deaths", "total_assists",
+                        "created_date", "team_id", "role", "country_id")
+
     def __init__(self, name: str, rating: int = 50, role: str = "Rifler", team_id: int = None):
+        self._db_state = {}
         self.name = name
         self.base_rating = rating
         self.current_rating = rating
@@ -18,21 +135,67 @@ class CareerPlayer:
         self.total_kills = 0
         self.total_deaths = 0
         self.total_assists = 0
+        self.win_streak = 0
+        self.rules = DEFAULT_RULES
         self.achievements = []
+        self._saved_achievements = {}  # db key -> names already written there
         self.created_date = datetime.now().isoformat()
         self.role = role
         self.team_id = team_id
         self.country_id = None
+        self.pending_events = []  # (type, data) not yet appended to the career event log
+
+    @property
+    def achievements(self) -> List[str]:
+        """Unlocked achievement names, in unlock order"""
+        return list(self.unlocked)
+
+    @achievements.setter
+    def achievements(self, names):
+        self.unlocked = dict.fromkeys(names)  # name -> unlock time (None if unknown)
+        self._rule_progress = {}
+
+    def set_achievement_rules(self, rules: AchievementRules):
+        self.rules = rules
+        self._rule_progress = {}
+
+    def record_event(self, event_type: str, data: Dict):
+        self.pending_events.append((event_type, data))
+
+    def unlock(self, name: str):
+        if name not in self.unlocked:
+            self.unlocked[name] = datetime.now().isoformat()
+            self.record_event("achievement_unlocked", {"name": name, "date": self.unlocked[name]})
+
+    def unsaved_achievements(self, db_key: str) -> Dict[str, Optional[str]]:
+        """Unlocks not yet written to db_key, with their unlock times"""
+        saved = self._saved_achievements.get(db_key, ())
+        return {name: date for name, date in self.unlocked.items() if name not in saved}
+
+    def mark_achievements_saved(self, db_key: str, names):
+        self._saved_achievements.setdefault(db_key, set()).update(names)
+
+    def forget_saved(self, db_key: str):
+        super().forget_saved(db_key)
+        self._saved_achievements.pop(db_key, None)
 
     def add_match_result(self, kills: int, deaths: int, assists: int, won: bool):
-        """Add results from a match"""
+        """Add results from a match.
+
+        Achievements on the stats a match changes unlock right after it,
+        level achievements once its experience is granted.
+        """
         self.matches_played += 1
         if won:
             self.wins += 1
+            self.win_streak += 1
+        else:
+            self.win_streak = 0
 
         self.total_kills += kills
         self.total_deaths += deaths
         self.total_assists += assists
+        self._check_achievements(MATCH_STATS)
 
         # Calculate experience gained
         exp_gained = self._calculate_experience(kills, deaths, assists, won)
@@ -52,37 +215,61 @@ class CareerPlayer:
         return max(10, total_exp)  # Minimum 10 exp
 
     def add_experience(self, amount: int):
-        """Add experience and handle leveling up"""
-        self.experience += amount
+        """Add experience and handle leveling up.
 
-        while self.experience >= self.experience_to_next:
-            self.level_up()
+        The new level is looked up in the cumulative XP table instead of
+        leveling up one step at a time, with the same result as repeated
+        level_up calls.
+        """
+        level = self.level
+        self.experience += amount
+        if self.experience < self.experience_to_next:
+            self._record_experience(amount, level)
+            return
+
+        _extend_level_tables(level, 0)
+        if _LEVEL_XP[level] != self.experience_to_next:
+            # Not on the standard curve (e.g. an old save), so step through it
+            while self.experience >= self.experience_to_next:
+                self.level_up()
+            self._record_experience(amount, level)
+            return
+
+        total_xp = _LEVEL_TOTAL_XP[level] + self.experience
+        _extend_level_tables(level, total_xp)
+        self.level = bisect_right(_LEVEL_TOTAL_XP, total_xp) - 1
+        self.experience = total_xp - _LEVEL_TOTAL_XP[self.level]
+        self.experience_to_next = _LEVEL_XP[self.level]
+        # Gains are positive, so capping once equals capping after every level
+        self.current_rating = min(MAX_RATING, self.current_rating + _LEVEL_RATING[self.level] - _LEVEL_RATING[level])
+        self._record_experience(amount, level)
+
+        # Level rules unlock in threshold order, as they would one level at a time
+        self._check_achievements(("level",))
+
+    def _record_experience(self, amount: int, old_level: int):
+        """Log an XP grant with the resulting state, so replays don't depend on the XP curve"""
+        self.record_event("xp_granted", {"amount": amount, "level": self.level, "experience": self.experience,
+                                         "experience_to_next": self.experience_to_next,
+                                         "current_rating": self.current_rating})
+        if self.level != old_level:
+            self.record_event("level_up", {"from": old_level, "level": self.level})
 
     def level_up(self):
         """Level up the player"""
         self.experience -= self.experience_to_next
         self.level += 1
-        self.experience_to_next = int(self.experience_to_next * 1.2)  # Exponential growth
+        self.experience_to_next = int(self.experience_to_next * XP_GROWTH)  # Exponential growth
 
         # Improve rating
-        rating_improvement = min(5, self.level // 5 + 1)  # Max 5 rating per level up
-        self.current_rating = min(100, self.current_rating + rating_improvement)
+        self.current_rating = min(MAX_RATING, self.current_rating + level_rating_gain(self.level))
 
         # Check for achievements
-        self._check_achievements()
-
-    def _check_achievements(self):
-        """Check and unlock achievements"""
-        if self.level >= 5 and "Rising Star" not in self.achievements:
-            self.achievements.append("Rising Star")
-        if self.matches_played >= 10 and "Veteran" not in self.achievements:
-            self.achievements.append("Veteran")
-        if self.wins >= 5 and "Winner" not in self.achievements:
-            self.achievements.append("Winner")
-        if self.total_kills >= 50 and "Killer" not in self.achievements:
-            self.achievements.append("Killer")
-        if self.get_kdr() >= 1.5 and "Sharpshooter" not in self.achievements:
-            self.achievements.append("Sharpshooter")
+        self._check_achievements(("level",))
+
+    def _check_achievements(self, stats=tuple(ACHIEVEMENT_STATS)):
+        """Check and unlock the achievements depending on stats"""
+        self.rules.evaluate(self, stats)
 
     def get_kdr(self) -> float:
         """Get kill/death ratio"""
@@ -152,18 +339,35 @@ class CareerPlayer:
         return player
 
 
-class Career:
+class Career(Persisted):
     """Represents a career save file"""
+    PERSISTED_FIELDS = ("created_date", "last_played", "total_matches", "tournaments_won",
+                        "current_streak", "best_streak")
+
     def __init__(self, player_name: str, role: str = "Rifler", team_id: int = None):
+        self._db_state = {}
         self.player_name = player_name
         self.player = CareerPlayer(player_name, role=role, team_id=team_id)
         self.created_date = datetime.now().isoformat()
         self.last_played = datetime.now().isoformat()
         self.total_matches = 0
         self.tournaments_won = 0
-        self.current_streak = 0
         self.best_streak = 0
 
+    @property
+    def current_streak(self) -> int:
+        """Current win streak, kept on the player so streak achievements can see it"""
+        return self.player.win_streak
+
+    @current_streak.setter
+    def current_streak(self, value: int):
+        self.player.win_streak = value
+
+    @property
+    def pending_events(self) -> List[Tuple[str, Dict]]:
+        """Events since the last write, appended to the event log on the next save"""
+        return self.player.pending_events
+
     def update_last_played(self):
         """Update the last played timestamp"""
         self.last_played = datetime.now().isoformat()
@@ -172,21 +376,85 @@ class Career:
         """Add a match result to the career"""
         self.total_matches += 1
         self.update_last_played()
-
-        # Update streak
-        if won:
-            self.current_streak += 1
-            self.best_streak = max(self.best_streak, self.current_streak)
-        else:
-            self.current_streak = 0
-
-        # Update player stats
+        self.player.record_event("match_played", {
+            "opponent": opponent_team, "won": bool(won), "date": self.last_played,
+            "kills": player_stats.get("kills", 0),
+            "deaths": player_stats.get("deaths", 0),
+            "assists": player_stats.get("assists", 0)
+        })
+
+        # Update player stats (and the win streak)
         self.player.add_match_result(
             player_stats.get("kills", 0),
             player_stats.get("deaths", 0),
             player_stats.get("assists", 0),
             won
         )
+        self.best_streak = max(self.best_streak, self.current_streak)
+
+    def transfer(self, team_id: Optional[int]):
+        """Move the player to another team"""
+        self.player.team_id = team_id
+        self.player.record_event("transfer", {"team_id": team_id})
+
+    def apply_event(self, event_type: str, data: Dict):
+        """Replay a logged event onto this career.
+
+        Events are applied as recorded facts: no experience is recalculated
+        and no achievement rules run, so the result does not depend on the
+        current rules or XP curve. Nothing new is logged.
+        """
+        player = self.player
+        if event_type == "match_played":
+            self.total_matches += 1
+            self.last_played = data["date"]
+            player.matches_played += 1
+            if data["won"]:
+                player.wins += 1
+                player.win_streak += 1
+            else:
+                player.win_streak = 0
+            player.total_kills += data["kills"]
+            player.total_deaths += data["deaths"]
+            player.total_assists += data["assists"]
+            self.best_streak = max(self.best_streak, player.win_streak)
+        elif event_type == "xp_granted":
+            player.level = data["level"]
+            player.experience = data["experience"]
+            player.experience_to_next = data["experience_to_next"]
+            player.current_rating = data["current_rating"]
+        elif event_type == "level_up":
+            player.level = data["level"]
+        elif event_type == "achievement_unlocked":
+            player.unlocked.setdefault(data["name"], data["date"])
+        elif event_type == "transfer":
+            player.team_id = data["team_id"]
+        else:
+            raise ValueError(f"Unknown career event type: {event_type}")
+
+    @classmethod
+    def replay_persisted(cls, career_state: Dict, player_state: Dict, events) -> Tuple[Dict, Dict]:
+        """Persisted career and player columns after applying events to the given ones"""
+        career = cls(career_state.get("player_name", ""))
+        for field in cls.PERSISTED_FIELDS:
+            setattr(career, field, career_state[field])
+        for field in CareerPlayer.PERSISTED_FIELDS:
+            setattr(career.player, field, player_state[field])
+        for event_type, data in events:
+            career.apply_event(event_type, data)
+        return career.persisted_state(), career.player.persisted_state()
+
+    def snapshot(self) -> Dict:
+        """Full state for the event log: to_dict plus unlock times"""
+        data = self.to_dict()
+        data["player"]["unlocked"] = list(self.player.unlocked.items())
+        return data
+
+    @classmethod
+    def from_snapshot(cls, data: Dict) -> 'Career':
+        career = cls.from_dict(data)
+        career.player.unlocked.update(data["player"].get("unlocked", ()))
+        return career
 
     def get_career_summary(self) -> Dict:
         """Get a summary of the career"""
@@ -237,9 +505,15 @@ class CareerManager:
     def __init__(self, db_path: str = "cs2_simulator.db"):
         self.db = CS2Database(db_path)
 
+    def _use_database_rules(self, career: Career):
+        """Evaluate a new career's achievements with the rules in the database"""
+        if career.player.rules is DEFAULT_RULES:
+            career.player.set_achievement_rules(AchievementRules(self.db.get_achievement_rules()))
+
     def save_career(self, career: Career) -> bool:
         """Save a career to database"""
         try:
+            self._use_database_rules(career)
             career_id = self.db.save_career(career)
             return career_id is not None
         except Exception as e:
@@ -254,6 +528,25 @@ class CareerManager:
             print(f"Error loading career: {e}")
             return None
 
+    def load_career_at(self, player_name: str, seq: int) -> Optional[Career]:
+        """The career as it was right after its event seq (see get_career_events)"""
+        try:
+            return self.db.load_career(player_name, at_seq=seq)
+        except Exception as e:
+            print(f"Error loading career: {e}")
+            return None
+
+    def get_career_events(self, player_name: str, after_seq: int = 0, limit: int = 1000) -> List[Dict]:
+        """The career's event log after after_seq, oldest first"""
+        try:
+            career_id = self._career_id(player_name)
+            if career_id is not None:
+                return self.db.get_career_events(career_id, after_seq, limit)
+            return []
+        except Exception as e:
+            print(f"Error getting career events: {e}")
+            return []
+
     def list_careers(self) -> List[str]:
         """List all saved career player names"""
         try:
@@ -267,6 +560,10 @@ class CareerManager:
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
+                for table in ('career_events', 'career_snapshots'):
+                    cursor.execute(f'''DELETE FROM {table}
+                                      WHERE career_id IN (SELECT id FROM careers WHERE player_name = ?)''',
+                                   (player_name,))
                 cursor.execute('DELETE FROM careers WHERE player_name = ?', (player_name,))
                 cursor.execute('DELETE FROM career_players WHERE name = ?', (player_name,))
                 conn.commit()
@@ -278,51 +575,164 @@ class CareerManager:
     def add_match_to_career(self, player_name: str, opponent_team: str, won: bool,
                            player_stats: Dict) -> bool:
         """Add a match result to a career"""
+        # Create a new career if none exists yet; it is saved with the match
+        career = self.load_career(player_name) or Career(player_name)
+        return self.record_match(career, opponent_team, won, player_stats)
+
+    def record_match(self, career: Career, opponent_team: str, won: bool, player_stats: Dict,
+                     result=None) -> bool:
+        """Apply a match result to an in-memory career and save everything in one transaction.
+
+        Pass the SeriesResult as result to also keep the full box score. On
+        failure nothing is written, but career has already been updated in
+        memory, so callers should reload it.
+        """
         try:
-            # Always save the career first to ensure it exists
-            career = self.load_career(player_name)
-            if not career:
-                # If not found, create and save a new career
-                career = Career(player_name)
-                self.save_career(career)
-
-            # Add match to career object
-            career.add_match_result(opponent_team, won, player_stats)
-
-            # Save updated career
-            self.save_career(career)
-
-            # Add match to database
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT id FROM careers WHERE player_name = ?', (player_name,))
-                career_row = cursor.fetchone()
-                if career_row:
-                    self.db.add_career_match(
-                        career_row[0], opponent_team, won,
-                        player_stats.get("kills", 0),
-                        player_stats.get("deaths", 0),
-                        player_stats.get("assists", 0)
-                    )
+            self._use_database_rules(career)
+            self.db.record_career_match(career, opponent_team, won, player_stats, result)
             return True
         except Exception as e:
             print(f"Error adding match to career: {e}")
             return False
 
+    def career_team(self, career: Career) -> Team:
+        """The career player's team lineup, with the career player in place of whoever had their role"""
+        user_name = career.player_name
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT name FROM teams WHERE id = ?', (career.player.team_id,))
+            team_row = cursor.fetchone()
+            team_name = team_row[0] if team_row else "Free Agent"
+            cursor.execute('SELECT id FROM roles WHERE name = ?', (career.player.role,))
+            role_row = cursor.fetchone()
+            role_id = role_row[0] if role_row else None
+            cursor.execute('SELECT name, rating, role_id FROM players WHERE team_id = ?', (career.player.team_id,))
+            db_players = cursor.fetchall()
+        # Remove any player with the same role as the career player, then add the career player if not present
+        players = [p for p in db_players if p[2] != role_id or p[0] == user_name]
+        if not any(p[0] == user_name for p in players):
+            players = [(user_name, career.player.base_rating, role_id)] + players
+        return Team.from_roster(team_name, [(name, rating) for name, rating, _ in players[:5]])
+
+    def fast_forward(self, player_name: str, n_matches: Optional[int] = None, until_level: Optional[int] = None,
+                     season: Optional[List] = None, series_type: str = "BO1", seed: Optional[int] = None,
+                     checkpoint_every: Optional[int] = None) -> Dict:
+        """Play many career matches without the UI.
+
+        Stops after n_matches, once the player reaches until_level, or at
+        the end of season (a list of opponent names or (opponent,
+        series_type) pairs), whichever comes first; without a season
+        opponents are drawn at random. Simulation, XP, levels and
+        achievements all run in memory. Results are written in one batch at
+        the end, or every checkpoint_every matches. Every match is seeded
+        from seed, so the run is reproducible and each match replayable.
+        """
+        if n_matches is None and until_level is None and season is None:
+            raise ValueError("Give n_matches, until_level or season")
+        start = time.perf_counter()
+        career = self.load_career(player_name)
+        if career is None:
+            raise ValueError(f"No career named {player_name}")
+        rng = random.Random(seed)
+        team = self.career_team(career)
+        rosters = self.db.get_team_rosters()
+        opponents = {}  # Built lazily, each opponent's lineup is reused for all its matches
+        if season is not None:
+            fixtures = [(f, series_type) if isinstance(f, str) else tuple(f) for f in season]
+        else:
+            names = sorted(name for name, roster in rosters.items()
+                           if roster and name not in (team.name, "Free Agent"))
+            fixtures = None
+
+        level, achievements = career.player.level, set(career.player.achievements)
+        pending, played, wins = [], 0, 0
+        while True:
+            if n_matches is not None and played >= n_matches:
+                break
+            if until_level is not None and career.player.level >= until_level:
+                break
+            if fixtures is not None:
+                if played >= len(fixtures):
+                    break
+                opponent_name, match_type = fixtures[played]
+            else:
+                opponent_name, match_type = rng.choice(names), series_type
+            opponent = opponents.get(opponent_name)
+            if opponent is None:
+                opponent = opponents[opponent_name] = Team.from_roster(opponent_name, rosters[opponent_name])
+
+            result = play_series(team, opponent, match_type, seed=rng.getrandbits(63))
+            team_stats = result.player_stats[team.name]
+            user_stats = next((p for p in team_stats if p["name"] == player_name), team_stats[0])
+            stats = {"kills": user_stats["kills"], "deaths": user_stats["deaths"], "assists": user_stats["assists"]}
+            won = result.winner == team.name
+            career.add_match_result(opponent_name, won, stats)
+            pending.append((opponent_name, won, stats, result))
+            played += 1
+            wins += won
+            if checkpoint_every and len(pending) >= checkpoint_every:
+                self.db.record_career_matches(career, pending)
+                pending = []
+        if pending:
+            self.db.record_career_matches(career, pending)
+
+        return {
+            "career": career,
+            "matches": played,
+            "wins": wins,
+            "losses": played - wins,
+            "levels_gained": career.player.level - level,
+            "new_achievements": [a for a in career.player.achievements if a not in achievements],
+            "elapsed": time.perf_counter() - start
+        }
+
+    def _career_id(self, player_name: str) -> Optional[int]:
+        with self.db.get_connection() as conn:
+            row = conn.execute('SELECT id FROM careers WHERE player_name = ?', (player_name,)).fetchone()
+            return row[0] if row else None
+
     def get_career_match_history(self, player_name: str, limit: int = 1000) -> List[Dict]:
         """Get all match history for a career (default: up to 1000 matches)"""
         try:
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT id FROM careers WHERE player_name = ?', (player_name,))
-                career_row = cursor.fetchone()
-                if career_row:
-                    return self.db.get_career_match_history(career_row[0], limit)
-                return []
+            career_id = self._career_id(player_name)
+            if career_id is not None:
+                return self.db.get_career_match_history(career_id, limit)
+            return []
         except Exception as e:
             print(f"Error getting match history: {e}")
             return []
 
+    def get_career_match_page(self, player_name: str, after=None, page_size: int = 50,
+                              opponent: Optional[str] = None, won: Optional[bool] = None):
+        """One page of match history and the cursor for the next page (see CS2Database.get_career_match_page)"""
+        try:
+            career_id = self._career_id(player_name)
+            if career_id is not None:
+                return self.db.get_career_match_page(career_id, after, page_size, opponent, won)
+            return [], None
+        except Exception as e:
+            print(f"Error getting match history: {e}")
+            return [], None
+
+    def count_career_matches(self, player_name: str, opponent: Optional[str] = None,
+                             won: Optional[bool] = None) -> Dict:
+        """Match, win and loss counts for a career"""
+        try:
+            career_id = self._career_id(player_name)
+            if career_id is not None:
+                return self.db.count_career_matches(career_id, opponent, won)
+        except Exception as e:
+            print(f"Error counting matches: {e}")
+        return {"matches": 0, "wins": 0, "losses": 0}
+
+    def get_match_box_score(self, match_id: int):
+        """Full SeriesResult of a career match, replayed from its seed or decoded from its stored box score"""
+        try:
+            return self.db.replay_match(match_id) or self.db.get_career_match_box_score(match_id)
+        except Exception as e:
+            print(f"Error loading match details: {e}")
+            return None
+
     def get_database_stats(self) -> Dict:
         """Get database statistics"""
         return self.db.get_database_stats()
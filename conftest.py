@@ -0,0 +1,23 @@
+import sys
+import os
+
+import pytest
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cs2_simulator import load_teams_from_json, Team, Player
+
+
+@pytest.fixture(scope="session")
+def teams_dict():
+    """Rosters from teams.json"""
+    return load_teams_from_json(os.path.join(os.path.dirname(os.path.abspath(__file__)), "teams.json"))
+
+
+@pytest.fixture
+def make_team(teams_dict):
+    """Builds fresh Team/Player objects for a teams.json roster"""
+    def make(name):
+        return Team(name, [Player(p["name"], p["rating"]) for p in teams_dict[name]])
+    return make
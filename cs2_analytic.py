@@ -0,0 +1,179 @@
+"""
+Exact win probabilities for the simulation model.
+
+Instead of sampling simulate_series thousands of times, this module computes
+the per-round win probability by integrating the cubic formula of
+simulate_round over the form noise of Team.get_power, then runs a
+dynamic program over (score1, score2) with the same 13-win / MR3 overtime
+rules as simulate_match. Results are cached per rating pair, so repeated
+lookups for the same matchup are effectively free.
+"""
+import math
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from cs2_simulator import (ROUNDS_TO_WIN, MAX_ROUNDS, FORM_SPREAD, SERIES_MAPS_TO_WIN,
+                           next_overtime)
+
+QUADRATURE_POINTS = 8  # Gauss-Legendre nodes per unit interval of the noise density
+
+
+@lru_cache(maxsize=None)
+def _gauss_legendre(m: int) -> Tuple[Tuple[float, float], ...]:
+    """Nodes and weights of the m-point Gauss-Legendre rule on [-1, 1]"""
+    rule = []
+    for i in range(1, m + 1):
+        x = math.cos(math.pi * (i - 0.25) / (m + 0.5))
+        for _ in range(100):
+            p0, p1 = 1.0, x
+            for k in range(2, m + 1):
+                p0, p1 = p1, ((2 * k - 1) * x * p1 - (k - 1) * p0) / k
+            dp = m * (x * p1 - p0) / (x * x - 1)
+            dx = p1 / dp
+            x -= dx
+            if abs(dx) < 1e-15:
+                break
+        rule.append((x, 2 / ((1 - x * x) * dp * dp)))
+    return tuple(rule)
+
+
+@lru_cache(maxsize=None)
+def _noise_quadrature(players: int) -> Tuple[Tuple[float, float], ...]:
+    """Quadrature (noise, weight) pairs for the mean form noise of a team.
+
+    The mean of n uniform draws in [-FORM_SPREAD, FORM_SPREAD] is a scaled
+    Irwin-Hall variable, whose density is a polynomial on each unit interval,
+    so a Gauss rule per interval integrates it almost exactly.
+    """
+    norm = math.factorial(players - 1)
+    points = []
+    for piece in range(players):
+        for t, w in _gauss_legendre(QUADRATURE_POINTS):
+            s = piece + (t + 1) / 2
+            density = sum((-1) ** k * math.comb(players, k) * (s - k) ** (players - 1)
+                          for k in range(piece + 1)) / norm
+            noise = 2 * FORM_SPREAD * s / players - FORM_SPREAD
+            points.append((noise, w / 2 * density))
+    return tuple(points)
+
+
+@lru_cache(maxsize=4096)
+def round_win_probability(rating1: float, rating2: float, players1: int = 5, players2: int = 5) -> float:
+    """Probability that a team with average rating1 wins a round against one with rating2"""
+    noise2 = _noise_quadrature(players2)
+    powers2 = [(rating2 + x2, w2) for x2, w2 in noise2]
+    cubes2 = [(p2 ** 3, w2) for p2, w2 in powers2]
+    lowest2 = min(p2 for p2, _ in powers2)
+    total = 0.0
+    for x1, w1 in _noise_quadrature(players1):
+        p1 = rating1 + x1
+        cube1 = p1 ** 3
+        if p1 + lowest2 > 0:
+            inner = cube1 * sum([w2 / (cube1 + cube2) for cube2, w2 in cubes2])
+        else:
+            inner = sum([w2 * cube1 / (cube1 + p2 ** 3) if p1 + p2 > 0 else w2 * 0.5
+                         for p2, w2 in powers2])
+        total += w1 * inner
+    return total
+
+
+@lru_cache(maxsize=None)
+def _map_paths() -> Tuple[Tuple[Tuple[bool, int, int, int], int, float], ...]:
+    """Every final map result with its number of round sequences.
+
+    Each sequence ending at (score1, score2) has probability
+    p^score1 * q^score2, so a result's probability is paths * share *
+    p^score1 * q^score2, where share halves the coin-flip tie at MAX_ROUNDS.
+    Counting paths once keeps each distribution a short polynomial sum.
+    """
+    finished = {}
+    # State: (score1, score2, target, margin, overtime_level) -> number of round sequences
+    states = {(0, 0, ROUNDS_TO_WIN, 1, 0): 1}
+    while states:
+        next_states = {}
+        for (score1, score2, target, margin, level), paths in states.items():
+            for s1, s2 in ((score1 + 1, score2), (score1, score2 + 1)):
+                if s1 + s2 >= MAX_ROUNDS:
+                    if s1 == s2:
+                        # Tie, random winner
+                        for won in (True, False):
+                            key = (won, s1, s2, level)
+                            finished[key] = (finished.get(key, (0, 0.5))[0] + paths, 0.5)
+                    else:
+                        key = (s1 > s2, s1, s2, level)
+                        finished[key] = (finished.get(key, (0, 1.0))[0] + paths, 1.0)
+                    continue
+                if (s1 >= target and s1 - s2 >= margin) or (s2 >= target and s2 - s1 >= margin):
+                    key = (s1 > s2, s1, s2, level)
+                    finished[key] = (finished.get(key, (0, 1.0))[0] + paths, 1.0)
+                    continue
+                state = (s1, s2) + (next_overtime(s1, s2, target) or (target, margin, level))
+                next_states[state] = next_states.get(state, 0) + paths
+        states = next_states
+    return tuple(sorted((key, paths, share) for key, (paths, share) in finished.items()))
+
+
+@lru_cache(maxsize=4096)
+def _map_distribution(p_round: float) -> Tuple[Tuple[Tuple[bool, int, int, int], float], ...]:
+    q_round = 1 - p_round
+    return tuple((key, paths * share * p_round ** key[1] * q_round ** key[2])
+                 for key, paths, share in _map_paths())
+
+
+def map_score_distribution(p_round: float) -> Dict[Tuple[bool, int, int, int], float]:
+    """Distribution of final map results for a per-round team1 win probability.
+
+    Keys are (team1_won, score1, score2, overtime_level) and cover every score
+    simulate_match can produce, including the coin-flip tie at MAX_ROUNDS.
+    """
+    return dict(_map_distribution(p_round))
+
+
+def map_win_probability(p_round: float) -> float:
+    """Probability that team1 wins a map"""
+    return sum(prob for (won, _, _, _), prob in _map_distribution(p_round) if won)
+
+
+def series_score_distribution(p_map: float, series_type: str) -> Dict[Tuple[int, int], float]:
+    """Distribution of final series scores (team1 maps, team2 maps)"""
+    if series_type not in SERIES_MAPS_TO_WIN:
+        raise ValueError("Invalid series type")
+    maps_to_win = SERIES_MAPS_TO_WIN[series_type]
+    q_map = 1 - p_map
+    distribution = {}
+    for lost in range(maps_to_win):
+        paths = math.comb(maps_to_win - 1 + lost, lost)
+        distribution[(maps_to_win, lost)] = paths * p_map ** maps_to_win * q_map ** lost
+        distribution[(lost, maps_to_win)] = paths * q_map ** maps_to_win * p_map ** lost
+    return distribution
+
+
+def series_win_probability(p_map: float, series_type: str) -> float:
+    """Probability that team1 wins a BO1/BO3/BO5 series"""
+    distribution = series_score_distribution(p_map, series_type)
+    return sum(prob for (wins1, wins2), prob in distribution.items() if wins1 > wins2)
+
+
+def team_average_rating(team) -> float:
+    """Average player rating, which is all Team.get_power depends on besides form"""
+    return sum(p.rating for p in team.players) / len(team.players)
+
+
+@lru_cache(maxsize=4096)
+def _odds(rating1: float, rating2: float, players1: int, players2: int) -> Tuple[float, ...]:
+    p_round = round_win_probability(rating1, rating2, players1, players2)
+    p_map = map_win_probability(p_round)
+    return (p_round, p_map) + tuple(series_win_probability(p_map, series_type)
+                                    for series_type in SERIES_MAPS_TO_WIN)
+
+
+def rating_odds(rating1: float, rating2: float, players1: int = 5, players2: int = 5) -> Dict[str, float]:
+    """Exact win probabilities per round, map and BO1/BO3/BO5 series for two average ratings"""
+    values = _odds(rating1, rating2, players1, players2)
+    return dict(zip(("round", "map") + tuple(SERIES_MAPS_TO_WIN), values))
+
+
+def matchup_odds(team1, team2) -> Dict[str, float]:
+    """Exact team1 win probabilities per round, map and BO1/BO3/BO5 series"""
+    return rating_odds(team_average_rating(team1), team_average_rating(team2),
+                       len(team1.players), len(team2.players))
@@ -6,14 +6,17 @@ import json
 # Add the current directory to the path so we can import cs2_simulator
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
-    from cs2_simulator import load_teams_from_json, Team, Player, simulate_series, print_player_stats
+    from cs2_simulator import load_teams_from_json, Team, Player, play_series, new_seed
     from career_system import CareerManager, Career, CareerPlayer
     from cs2_database import CS2Database
-    from career_db_utils import create_career_database
+    from career_db_utils import (create_career_database, open_career_database, open_career_slot,
+                                 list_career_databases, career_db_path, delete_career_slot)
 except ImportError as e:
     print(f"Error importing modules: {e}")
     sys.exit(1)
 
+HISTORY_PAGE_SIZE = 50  # Matches fetched per "Load more" in the match history
+
 class CS2SimulatorApp:
     def __init__(self, root):
         self.root = root
@@ -214,8 +217,8 @@ class CS2SimulatorApp:
         career_select_frame = ttk.LabelFrame(self.main_container, text="Career Mode", padding="15")
         career_select_frame.pack(fill=tk.X, pady=(0, 15))
 
-        # Check for existing careers
-        existing_careers = self.career_manager.list_careers()
+        # Check for existing careers (one save slot file each)
+        existing_careers = list_career_databases()
 
         if existing_careers:
             ttk.Label(career_select_frame, text="Load Career:").pack(anchor=tk.W, pady=(0, 5))
@@ -223,14 +226,18 @@ class CS2SimulatorApp:
             career_listbox = tk.Listbox(career_select_frame, height=3)
             career_listbox.pack(fill=tk.X, pady=(0, 10))
 
-            for career_name in existing_careers:
+            for career_name, _ in existing_careers:
                 career_listbox.insert(tk.END, career_name)
 
             def load_selected_career():
                 selection = career_listbox.curselection()
                 if selection:
-                    career_name = existing_careers[selection[0]]
-                    career = self.career_manager.load_career(career_name)
+                    career_name, slot_path = existing_careers[selection[0]]
+                    self.db = open_career_slot(slot_path)
+                    self.career_manager.db = self.db
+                    # A slot holds a single career
+                    names = self.career_manager.list_careers()
+                    career = self.career_manager.load_career(names[0]) if names else None
                     if career:
                         self.current_career = career
                         self.show_career_dashboard()
@@ -243,11 +250,12 @@ class CS2SimulatorApp:
             def delete_selected_career():
                 selection = career_listbox.curselection()
                 if selection:
-                    career_name = existing_careers[selection[0]]
-                    from career_db_utils import delete_career_file
-                    deleted = delete_career_file(career_name)
-                    # Remove from main DB
-                    self.career_manager.delete_career(career_name)
+                    career_name, slot_path = existing_careers[selection[0]]
+                    # Stop using the slot before its file goes away; the career lives only in it
+                    self.db = CS2Database()
+                    self.career_manager.db = self.db
+                    self.current_career = None
+                    deleted = delete_career_slot(slot_path)
                     if deleted:
                         messagebox.showinfo("Deleted", f"Career '{career_name}' deleted.")
                         self.show_career_ui()
@@ -382,14 +390,14 @@ class CS2SimulatorApp:
             return
 
         # Check if career already exists
-        if player_name in self.career_manager.list_careers():
+        if os.path.exists(career_db_path(player_name)):
             messagebox.showerror("Error", "A career with this name already exists")
             return
 
-        # Create a new DB for this career
-        new_db_path = create_career_database(player_name)
+        # Create a save slot for this career on top of the shared database
+        create_career_database(player_name)
         # Use this DB for all career operations
-        self.db = CS2Database(new_db_path)
+        self.db = open_career_database(player_name)
 
         self.current_career = Career(player_name, role=selected_role, team_id=selected_team_id)
         # Assign selected country id to career player
@@ -492,20 +500,41 @@ class CS2SimulatorApp:
         history_frame = ttk.LabelFrame(self.main_container, text="Match History", padding="15")
         history_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
 
-        # Get all match history from DB
-        matches = self.career_manager.get_career_match_history(self.current_career.player_name, limit=1000)
+        # Match history is paged from the DB; "Load more" fetches the next page
+        player_name = self.current_career.player_name
+        matches, next_cursor = self.career_manager.get_career_match_page(player_name, page_size=HISTORY_PAGE_SIZE)
         if not matches:
             ttk.Label(history_frame, text="No matches played yet.").pack()
             return
 
+        counts = self.career_manager.count_career_matches(player_name)
+        ttk.Label(history_frame, text=f"{counts['matches']} matches - {counts['wins']}W / {counts['losses']}L").pack(anchor=tk.W)
+
         listbox = tk.Listbox(history_frame, height=10)
         listbox.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         match_map = {}
-        for idx, match in enumerate(matches):
-            # Format: [TEAM1] [SCORE1] - [SCORE2] [TEAM2] (date)
-            summary = f"{match.get('team1', 'You')} {match.get('score1', '?')} - {match.get('score2', '?')} {match.get('team2', match['opponent'])} ({match.get('date', '')})"
-            listbox.insert(tk.END, summary)
-            match_map[idx] = match
+
+        def add_matches(page):
+            for match in page:
+                # Format: [TEAM1] [SCORE1] - [SCORE2] [TEAM2] (date)
+                summary = f"{'W' if match['won'] else 'L'} vs {match['opponent']} - {match['kills']}/{match['deaths']}/{match['assists']} ({match.get('date', '')})"
+                match_map[listbox.size()] = match
+                listbox.insert(tk.END, summary)
+
+        add_matches(matches)
+
+        def load_more():
+            nonlocal next_cursor
+            page, next_cursor = self.career_manager.get_career_match_page(
+                player_name, after=next_cursor, page_size=HISTORY_PAGE_SIZE)
+            add_matches(page)
+            if next_cursor is None:
+                load_more_button.config(state=tk.DISABLED)
+
+        load_more_button = ttk.Button(history_frame, text="Load more", command=load_more)
+        load_more_button.pack(pady=(0, 10))
+        if next_cursor is None:
+            load_more_button.config(state=tk.DISABLED)
 
         def on_select(event):
             selection = listbox.curselection()
@@ -513,14 +542,22 @@ class CS2SimulatorApp:
                 return
             idx = selection[0]
             match = match_map[idx]
+            # The box score is only loaded when a match is opened
+            result = self.career_manager.get_match_box_score(match['id'])
+            if result is None:
+                messagebox.showinfo("Match Details",
+                                    f"{'Win' if match['won'] else 'Loss'} vs {match['opponent']}\n"
+                                    f"{match['kills']}K {match['deaths']}D {match['assists']}A")
+                return
             # Show detailed result in requested format
-            result_msg = f"{match.get('team1', 'You')} {match.get('score1', '?')} - {match.get('score2', '?')} {match.get('team2', match['opponent'])}\n\n"
-            result_msg += f"[{match.get('team1', 'You')}]\n"
-            for p in match.get('team1_players', []):
-                result_msg += f"{p['name']} {p['kills']}K {p['deaths']}D {p['assists']}A\n"
-            result_msg += f"\n[{match.get('team2', match['opponent'])}]\n"
-            for p in match.get('team2_players', []):
-                result_msg += f"{p['name']} {p['kills']}K {p['deaths']}D {p['assists']}A\n"
+            result_msg = f"{result.team1_name} {result.team1_wins} - {result.team2_wins} {result.team2_name}\n"
+            for line in result.map_results:
+                result_msg += f"{line}\n"
+            stats = result.player_stats
+            for team_name in (result.team1_name, result.team2_name):
+                result_msg += f"\n[{team_name}]\n"
+                for p in stats.get(team_name, []):
+                    result_msg += f"{p['name']} {p['kills']}K {p['deaths']}D {p['assists']}A\n"
             messagebox.showinfo("Match Details", result_msg)
 
         listbox.bind('<<ListboxSelect>>', on_select)
@@ -536,41 +573,18 @@ class CS2SimulatorApp:
         opponent_name = random.choice([name for name in self.team_names if name != "Free Agent"])
 
 
-        # Use actual team for career player
-        team_id = self.current_career.player.team_id
-        # Get team name from team_id
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT name FROM teams WHERE id = ?', (team_id,))
-            team_row = cursor.fetchone()
-            player_team_name = team_row[0] if team_row else "Free Agent"
-        # Always build the team lineup for simulation from the database, ensuring the career player is present and the original role is replaced
-        user_name = self.current_career.player_name
-        user_role = self.current_career.player.role
-        user_rating = self.current_career.player.base_rating
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT id FROM roles WHERE name = ?', (user_role,))
-            role_row = cursor.fetchone()
-            role_id = role_row[0] if role_row else None
-            # Get all players for the team
-            cursor.execute('SELECT name, rating, role_id FROM players WHERE team_id = ?', (team_id,))
-            db_players = cursor.fetchall()
-            # Remove any player with the same role as the career player
-            filtered_players = [p for p in db_players if p[2] != role_id or p[0] == user_name]
-            # Add the career player if not present
-            if not any(p[0] == user_name for p in filtered_players):
-                filtered_players = [(user_name, user_rating, role_id)] + filtered_players
-            # Only keep 5 players
-            filtered_players = filtered_players[:5]
-            player_team_data = [{"name": p[0], "rating": p[1]} for p in filtered_players]
-        player_team = Team(player_team_name, [Player(p["name"], p["rating"]) for p in player_team_data])
+        # Team lineup from the database, with the career player replacing their role
+        player_team = self.career_manager.career_team(self.current_career)
+        player_team_name = player_team.name
 
         opponent_data = self.teams_dict[opponent_name]
         opponent_team = Team(opponent_name, [Player(p["name"], p["rating"]) for p in opponent_data])
 
         # Simulate match
-        winner, loser, w_score, l_score, map_results, all_rounds, overtime_levels, match_player_stats = simulate_series(player_team, opponent_team, "BO1")
+        result = play_series(player_team, opponent_team, "BO1", seed=new_seed())
+        winner = result.winner
+        w_score, l_score = result.team1_wins, result.team2_wins
+        match_player_stats = result.player_stats
 
         # Find the user's player in their team for stats
         user_name = self.current_career.player_name
@@ -592,14 +606,11 @@ class CS2SimulatorApp:
             "assists": user_stats.get("assists", 0)
         }
 
-        success = self.career_manager.add_match_to_career(
-            self.current_career.player_name, opponent_name, won, player_stats
-        )
+        success = self.career_manager.record_match(self.current_career, opponent_name, won, player_stats, result)
 
-        if success:
-            # Reload career to get updated stats
+        if not success:
+            # Reload career to drop the unsaved in-memory result
             self.current_career = self.career_manager.load_career(self.current_career.player_name)
-        else:
             messagebox.showerror("Error", "Failed to save match result")
 
         # Show all player stats for both teams
@@ -765,25 +776,10 @@ class CS2SimulatorApp:
             team2_players = [Player(p["name"], p["rating"]) for p in team2_data]
             team2 = Team(team2_name, team2_players)
 
-            # Redirect stdout to capture print statements
-            import io
-            from contextlib import redirect_stdout
-
-            f = io.StringIO()
-            with redirect_stdout(f):
-                winner, loser, team1_wins, team2_wins, map_results, all_rounds, overtime_levels = simulate_series(team1, team2, series_type)
-
-                print("\n=== SERIES RESULTS ===")
-                print(f"{winner} wins the {series_type} series {team1_wins} - {team2_wins}")
-                print("\nMap results:")
-                for result in map_results:
-                    print(result)
-
-                print_player_stats(team1)
-                print_player_stats(team2)
+            # Simulate silently and render the report text once
+            results = play_series(team1, team2, series_type).render()
 
             # Display results
-            results = f.getvalue()
             self.results_text.delete(1.0, tk.END)
             self.results_text.insert(tk.END, results)
 
@@ -0,0 +1,172 @@
+"""
+Vectorized batch match engine.
+
+Simulates many maps between the same two teams at once with NumPy, using the
+same round model as simulate_round and the same 13-win / MR3 overtime rules as
+simulate_match. Intended for prediction jobs that need tens of thousands of maps.
+"""
+import numpy as np
+
+from cs2_simulator import (ROUNDS_TO_WIN, MAX_ROUNDS, MAX_OVERTIMES, OVERTIME_ROUNDS, FORM_SPREAD,
+                           lineups_hash, match_lineups, new_seed)
+
+REGULATION_ROUNDS = 2 * (ROUNDS_TO_WIN - 1)
+CHUNK_SIZE = 16384  # Maps per vectorized block, keeps the (maps, rounds, players) noise array small
+# Bump whenever a change makes the same seed, lineups and n produce different arrays
+BATCH_ENGINE_VERSION = 1
+
+
+class BatchResult:
+    """Per-map results of a batch simulation, stored as NumPy arrays.
+
+    seed, roster_hash and engine_version identify the inputs, so the same
+    arrays can be regenerated with simulate_matches_batch instead of stored.
+    """
+    def __init__(self, team1_name, team2_name, score1, score2, team1_won, overtime_levels,
+                 team1_stats, team2_stats, seed=None, roster_hash=None):
+        self.team1_name = team1_name
+        self.team2_name = team2_name
+        self.seed = seed
+        self.roster_hash = roster_hash
+        self.engine_version = BATCH_ENGINE_VERSION
+        self.score1 = score1
+        self.score2 = score2
+        self.team1_won = team1_won
+        self.overtime_levels = overtime_levels
+        self.team1_kills, self.team1_deaths, self.team1_assists = team1_stats
+        self.team2_kills, self.team2_deaths, self.team2_assists = team2_stats
+
+    def __len__(self):
+        return len(self.score1)
+
+    def team1_win_rate(self) -> float:
+        """Fraction of maps won by team1"""
+        return float(self.team1_won.mean()) if len(self) else 0.0
+
+
+def _team_arrays(team):
+    ratings = np.array([p.rating for p in team.players], dtype=float)
+    return ratings, ratings.mean(), ratings / ratings.sum()
+
+
+def _round_wins(rng, avg1, avg2, n1, n2, shape):
+    """Draw round winners (True = team1) for an array of rounds, as simulate_round does"""
+    # get_power is the mean of (rating + noise), i.e. the mean rating plus the mean noise.
+    # Players go on the leading axis so the sum runs over contiguous blocks.
+    p1 = rng.random((n1,) + shape).sum(axis=0)
+    p1 *= 2 * FORM_SPREAD / n1
+    p1 += avg1 - FORM_SPREAD
+    p2 = rng.random((n2,) + shape).sum(axis=0)
+    p2 *= 2 * FORM_SPREAD / n2
+    p2 += avg2 - FORM_SPREAD
+    p1 **= 3
+    p2 **= 3
+    total = p1 + p2
+    prob_t1_win = np.divide(p1, total, out=np.full(shape, 0.5), where=total > 0)
+    return rng.random(shape) < prob_t1_win
+
+
+def _randint_upto(rng, high):
+    """Uniform integers in [0, high] for an array of bounds (faster than integers() with array bounds)"""
+    return (rng.random(high.shape) * (high + 1)).astype(np.int64)
+
+
+def _simulate_chunk(rng, team1, team2, n):
+    ratings1, avg1, weights1 = _team_arrays(team1)
+    ratings2, avg2, weights2 = _team_arrays(team2)
+    n1, n2 = len(ratings1), len(ratings2)
+
+    # Regulation: draw all 24 rounds at once and cut each map where a team reaches 13
+    wins = _round_wins(rng, avg1, avg2, n1, n2, (n, REGULATION_ROUNDS))
+    cum1 = np.cumsum(wins, axis=1, dtype=np.int16)
+    cum2 = np.arange(1, REGULATION_ROUNDS + 1, dtype=np.int16) - cum1
+    decided = (cum1 >= ROUNDS_TO_WIN) | (cum2 >= ROUNDS_TO_WIN)
+    has_winner = decided.any(axis=1)
+    length = np.where(has_winner, decided.argmax(axis=1) + 1, REGULATION_ROUNDS)
+    played = np.arange(REGULATION_ROUNDS) < length[:, None]
+
+    score1 = cum1[np.arange(n), length - 1].astype(np.int64)
+    score2 = length - score1
+
+    win_kills = rng.integers(4, 7, (n, REGULATION_ROUNDS))
+    assist_counts = _randint_upto(rng, win_kills // 2)
+    t1_round = played & wins
+    t2_round = played & ~wins
+    kill_events1 = (win_kills * t1_round).sum(axis=1)
+    kill_events2 = (win_kills * t2_round).sum(axis=1)
+    assist_events1 = (assist_counts * t1_round).sum(axis=1)
+    assist_events2 = (assist_counts * t2_round).sum(axis=1)
+
+    # Overtime: step the remaining maps round by round with the simulate_match rules
+    tie_break = np.zeros(n, dtype=bool)
+    overtime_levels = np.zeros(n, dtype=np.int64)
+    active = np.flatnonzero(~has_winner)
+    target = np.full(len(active), ROUNDS_TO_WIN + OVERTIME_ROUNDS)
+    margin = np.full(len(active), 2)
+    overtime_levels[active] = 1
+    while len(active):
+        won = _round_wins(rng, avg1, avg2, n1, n2, (len(active),))
+        kills = rng.integers(4, 7, len(active))
+        assists = _randint_upto(rng, kills // 2)
+        score1[active] += won
+        score2[active] += ~won
+        kill_events1[active] += kills * won
+        kill_events2[active] += kills * ~won
+        assist_events1[active] += assists * won
+        assist_events2[active] += assists * ~won
+
+        s1, s2 = score1[active], score2[active]
+        done = (s1 + s2 >= MAX_ROUNDS) | ((s1 >= target) & (s1 - s2 >= margin)) | \
+               ((s2 >= target) & (s2 - s1 >= margin))
+        tied = done & (s1 == s2)
+        if tied.any():
+            # Tie at MAX_ROUNDS, random winner
+            tie_break[active[tied]] = rng.random(int(tied.sum())) < 0.5
+
+        next_ot = ~done & (s1 >= target - 1) & (s2 >= target - 1) & \
+                  (overtime_levels[active] < MAX_OVERTIMES)
+        target = np.where(next_ot, target + OVERTIME_ROUNDS, target)
+        margin = np.where(next_ot, margin + 1, margin)
+        overtime_levels[active] += next_ot
+
+        keep = ~done
+        active, target, margin = active[keep], target[keep], margin[keep]
+
+    # Each kill/death/assist event picks a player independently, so per-player
+    # totals over a map are multinomial in the number of events
+    team1_stats = (rng.multinomial(kill_events1, weights1),
+                   rng.multinomial(kill_events2, np.full(n1, 1.0 / n1)),
+                   rng.multinomial(assist_events1, weights1))
+    team2_stats = (rng.multinomial(kill_events2, weights2),
+                   rng.multinomial(kill_events1, np.full(n2, 1.0 / n2)),
+                   rng.multinomial(assist_events2, weights2))
+    team1_won = (score1 > score2) | ((score1 == score2) & tie_break)
+    return score1, score2, team1_won, overtime_levels, team1_stats, team2_stats
+
+
+def simulate_matches_batch(team1, team2, n, seed=None):
+    """Simulate n independent maps between team1 and team2.
+
+    Returns a BatchResult with per-map scores, overtime levels and per-player
+    K/D/A arrays of shape (n, players). Player and Team objects are not modified.
+    Without a seed a fresh one is drawn and recorded on the result; only a
+    Generator passed as seed leaves result.seed unset.
+    """
+    if seed is None:
+        seed = new_seed()
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    chunks = [_simulate_chunk(rng, team1, team2, min(CHUNK_SIZE, n - start))
+              for start in range(0, n, CHUNK_SIZE)]
+    if not chunks:
+        chunks = [_simulate_chunk(rng, team1, team2, 0)]
+
+    score1 = np.concatenate([c[0] for c in chunks])
+    score2 = np.concatenate([c[1] for c in chunks])
+    team1_won = np.concatenate([c[2] for c in chunks])
+    overtime_levels = np.concatenate([c[3] for c in chunks])
+    team1_stats = tuple(np.concatenate([c[4][i] for c in chunks]) for i in range(3))
+    team2_stats = tuple(np.concatenate([c[5][i] for c in chunks]) for i in range(3))
+    return BatchResult(team1.name, team2.name, score1, score2, team1_won, overtime_levels,
+                       team1_stats, team2_stats,
+                       seed=None if isinstance(seed, np.random.Generator) else seed,
+                       roster_hash=lineups_hash(match_lineups(team1, team2)))
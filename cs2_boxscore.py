@@ -0,0 +1,112 @@
+"""
+Compact binary encoding of a series box score.
+
+A SeriesResult is stored as a short varint stream: series type, both team
+names and every player name as ids from an interned name table, per-map
+overtime level, winner and round sequence (one bit per round), and each
+player's kills/deaths/assists. Scores and HLTV ratings are derived on
+decode, so a typical BO1 takes around 60 bytes.
+"""
+from typing import Callable, Dict, Iterable, List
+
+from cs2_simulator import SERIES_MAPS_TO_WIN, MapResult, SeriesResult, hltv_rating
+
+FORMAT_VERSION = 1
+SERIES_TYPES = tuple(SERIES_MAPS_TO_WIN)
+
+
+def _put_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _Reader:
+    """Sequential reader for varints and raw byte runs"""
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def varint(self) -> int:
+        value = shift = 0
+        while True:
+            byte = self.data[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def take(self, count: int) -> bytes:
+        chunk = self.data[self.pos:self.pos + count]
+        self.pos += count
+        return chunk
+
+
+def box_score_names(result: SeriesResult) -> List[str]:
+    """Every name a box score refers to, for interning before encode"""
+    names = [result.team1_name, result.team2_name]
+    for rows in result.player_rows.values():
+        names.extend(row[0] for row in rows)
+    return names
+
+
+def encode_box_score(result: SeriesResult, name_ids: Dict[str, int]) -> bytes:
+    """Pack a series result; name_ids maps every name in box_score_names to an int id"""
+    out = bytearray([FORMAT_VERSION])
+    _put_varint(out, SERIES_TYPES.index(result.series_type))
+    _put_varint(out, name_ids[result.team1_name])
+    _put_varint(out, name_ids[result.team2_name])
+    _put_varint(out, len(result.maps))
+    for m in result.maps:
+        _put_varint(out, m.overtime_level)
+        _put_varint(out, int(m.team1_won))
+        rounds = m.round_winners
+        _put_varint(out, len(rounds))
+        packed = bytearray((len(rounds) + 7) // 8)
+        for i, won in enumerate(rounds):
+            if won:
+                packed[i >> 3] |= 1 << (i & 7)
+        out += packed
+    for team_name in (result.team1_name, result.team2_name):
+        rows = result.player_rows.get(team_name, [])
+        _put_varint(out, len(rows))
+        for name, kills, deaths, assists, _ in rows:
+            for value in (name_ids[name], kills, deaths, assists):
+                _put_varint(out, value)
+    return bytes(out)
+
+
+def decode_box_score(data: bytes, resolve_names: Callable[[Iterable[int]], Dict[int, str]]) -> SeriesResult:
+    """Rebuild a SeriesResult; resolve_names maps a set of name ids to names"""
+    if not data or data[0] != FORMAT_VERSION:
+        raise ValueError("Unsupported box score format")
+    reader = _Reader(data)
+    reader.pos = 1
+    series_type = SERIES_TYPES[reader.varint()]
+    team1_id, team2_id = reader.varint(), reader.varint()
+
+    raw_maps = []
+    for _ in range(reader.varint()):
+        overtime_level = reader.varint()
+        team1_won = bool(reader.varint())
+        count = reader.varint()
+        packed = reader.take((count + 7) // 8)
+        rounds = bytearray((packed[i >> 3] >> (i & 7)) & 1 for i in range(count))
+        raw_maps.append((rounds, team1_won, overtime_level))
+
+    raw_rows = []
+    for _ in range(2):
+        raw_rows.append([tuple(reader.varint() for _ in range(4)) for _ in range(reader.varint())])
+
+    names = resolve_names({team1_id, team2_id} | {row[0] for rows in raw_rows for row in rows})
+    team1_name, team2_name = names[team1_id], names[team2_id]
+    maps = [MapResult(team1_name, team2_name, rounds, won, ot) for rounds, won, ot in raw_maps]
+    total_rounds = sum(len(m.round_winners) for m in maps)
+    player_rows = {
+        team_name: [(names[name_id], kills, deaths, assists, hltv_rating(kills, deaths, total_rounds))
+                    for name_id, kills, deaths, assists in rows]
+        for team_name, rows in zip((team1_name, team2_name), raw_rows)
+    }
+    return SeriesResult(team1_name, team2_name, series_type, maps, player_rows)
@@ -1,9 +1,131 @@
+import hashlib
 import sqlite3
 import os
+import random
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import json
 
+from cs2_backup import BACKUP_PAGES_PER_STEP, BackupJob, BackupScheduler, online_backup
+from cs2_boxscore import box_score_names, encode_box_score, decode_box_score
+from cs2_simulator import ENGINE_VERSION, Team, lineups_hash, play_series
+
+BUSY_TIMEOUT_MS = 5000       # How long a writer waits for a lock before failing
+STATEMENT_CACHE_SIZE = 256   # Prepared statements kept per connection
+CAREER_SNAPSHOT_EVERY = 100  # Career events between state snapshots, bounding the replay on load
+
+
+class PooledConnection(sqlite3.Connection):
+    """Connection owned by the pool; close() from callers is a no-op"""
+    released = False
+    base_path = None  # Shared base database attached by attach_base, if any
+
+    def close(self):
+        pass
+
+    def release(self):
+        """Really close the connection"""
+        self.released = True
+        super().close()
+
+
+class ConnectionPool:
+    """Long-lived, thread-local connections per database file.
+
+    Connections are opened once per thread and file, in WAL mode with
+    synchronous=NORMAL, so a commit no longer fsyncs the main database and
+    readers never block the writer.
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []  # (path, connection) across all threads, so files can be released
+
+    @staticmethod
+    def _key(db_path: str) -> str:
+        return db_path if db_path == ":memory:" else os.path.abspath(db_path)
+
+    def get(self, db_path: str) -> PooledConnection:
+        path = self._key(db_path)
+        connections = self._local.__dict__.setdefault("connections", {})
+        conn = connections.get(path)
+        if conn is None or conn.released:
+            conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, factory=PooledConnection,
+                                   cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+            connections[path] = conn
+            with self._lock:
+                self._connections.append((path, conn))
+        return conn
+
+    def release(self, db_path: Optional[str] = None):
+        """Close pooled connections to db_path (all files if None), e.g. before deleting the file"""
+        path = self._key(db_path) if db_path is not None else None
+        with self._lock:
+            keep = []
+            for conn_path, conn in self._connections:
+                if path is None or conn_path == path:
+                    conn.release()
+                else:
+                    keep.append((conn_path, conn))
+            self._connections = keep
+
+
+connection_pool = ConnectionPool()
+
+SHARED_TABLES = ("teams", "roles", "achievements")  # Read-only from a save slot
+OVERLAY_TABLES = ("players",)                       # Copy-on-write from a save slot
+
+
+def attach_base(conn, base_db_path: str):
+    """Layer a career save slot over the shared base database on one connection.
+
+    The base is attached as "base" and temp views named after the shared
+    tables hide the slot's own (empty) copies, since temp objects are
+    resolved first. SHARED_TABLES are plain views, so writing to them fails.
+    OVERLAY_TABLES rows come from the slot's slot_<table> when it has them
+    and from the base otherwise; INSTEAD OF triggers turn inserts, updates
+    and deletes into slot_<table> rows (deletes of base rows are kept as
+    tombstones in slot_removed_<table>). Rows inserted in the slot get
+    negative ids, so rows added to the base later never collide with them.
+    The base file is never written.
+    """
+    conn.execute('ATTACH DATABASE ? AS base', (os.path.abspath(base_db_path),))
+    for table in SHARED_TABLES:
+        conn.execute(f'CREATE TEMP VIEW {table} AS SELECT * FROM base.{table}')
+    for table in OVERLAY_TABLES:
+        columns = [row[1] for row in conn.execute(f'PRAGMA base.table_info({table})')]
+        names = ', '.join(columns)
+        new_values = ', '.join(f'NEW.{column}' for column in columns[1:])
+        # Trigger bodies can't name a schema, hence the slot_ tables rather than main.{table}
+        conn.executescript(f'''
+            CREATE TEMP VIEW {table} AS
+                SELECT {names} FROM main.slot_{table}
+                UNION ALL
+                SELECT {names} FROM base.{table} AS b
+                WHERE NOT EXISTS (SELECT 1 FROM main.slot_{table} s WHERE s.id = b.id)
+                  AND NOT EXISTS (SELECT 1 FROM main.slot_removed_{table} r WHERE r.id = b.id);
+
+            CREATE TEMP TRIGGER {table}_insert INSTEAD OF INSERT ON {table} BEGIN
+                INSERT INTO slot_{table} ({names}) VALUES (
+                    COALESCE(NEW.id, MIN(COALESCE((SELECT MIN(id) FROM main.slot_{table}), 0), 0) - 1),
+                    {new_values});
+            END;
+
+            CREATE TEMP TRIGGER {table}_update INSTEAD OF UPDATE ON {table} BEGIN
+                INSERT OR REPLACE INTO slot_{table} ({names}) VALUES (NEW.id, {new_values});
+            END;
+
+            CREATE TEMP TRIGGER {table}_delete INSTEAD OF DELETE ON {table} BEGIN
+                DELETE FROM slot_{table} WHERE id = OLD.id;
+                INSERT OR IGNORE INTO slot_removed_{table} (id) VALUES (OLD.id);
+            END;
+        ''')
+    conn.base_path = os.path.abspath(base_db_path)
+
 
 class CS2Database:
     """SQLite database manager for CS2 simulator"""
@@ -29,223 +151,347 @@ class CS2Database:
             conn.commit()
             return True
 
-    def __init__(self, db_path: str = "cs2_simulator.db"):
+    def __init__(self, db_path: str = "cs2_simulator.db", base_db_path: Optional[str] = None):
+        """With base_db_path, db_path is a career save slot layered over that base (see attach_base)"""
         self.db_path = db_path
+        self.base_db_path = base_db_path
+        self._key = ConnectionPool._key(db_path)  # Identifies this file in objects' saved state
+        self._achievement_rules = None
         self.init_database()
 
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's pooled database connection"""
+        conn = connection_pool.get(self.db_path)
+        if self.base_db_path is not None and conn.base_path is None:
+            attach_base(conn, self.base_db_path)
+        return conn
 
     def init_database(self):
-        """Initialize database tables"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Teams table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS teams (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    created_date TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            # Roles table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS roles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    description TEXT,
-                    icon TEXT
-                )
-            ''')
-
-            # Players table (for pro players)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS players (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    rating INTEGER NOT NULL,
-                    team_id INTEGER,
-                    role_id INTEGER,
-                    is_career_player BOOLEAN DEFAULT FALSE,
-                    FOREIGN KEY (team_id) REFERENCES teams (id),
-                    FOREIGN KEY (role_id) REFERENCES roles (id)
-                )
-            ''')
-
-            # Career players table (now with team_id and role)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS career_players (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    base_rating INTEGER DEFAULT 50,
-                    current_rating INTEGER DEFAULT 50,
-                    level INTEGER DEFAULT 1,
-                    experience INTEGER DEFAULT 0,
-                    experience_to_next INTEGER DEFAULT 100,
-                    matches_played INTEGER DEFAULT 0,
-                    wins INTEGER DEFAULT 0,
-                    total_kills INTEGER DEFAULT 0,
-                    total_deaths INTEGER DEFAULT 0,
-                    total_assists INTEGER DEFAULT 0,
-                    created_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                    team_id INTEGER,
-                    role TEXT,
-                    country_id INTEGER
-                )
-            ''')
-
-            # Achievements table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS achievements (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    description TEXT,
-                    icon TEXT
-                )
-            ''')
-
-            # Career player achievements (many-to-many)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS career_player_achievements (
-                    career_player_id INTEGER,
-                    achievement_id INTEGER,
-                    unlocked_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (career_player_id, achievement_id),
-                    FOREIGN KEY (career_player_id) REFERENCES career_players (id),
-                    FOREIGN KEY (achievement_id) REFERENCES achievements (id)
-                )
-            ''')
-
-            # Careers table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS careers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT UNIQUE NOT NULL,
-                    career_player_id INTEGER,
-                    created_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                    last_played TEXT DEFAULT CURRENT_TIMESTAMP,
-                    total_matches INTEGER DEFAULT 0,
-                    tournaments_won INTEGER DEFAULT 0,
-                    current_streak INTEGER DEFAULT 0,
-                    best_streak INTEGER DEFAULT 0,
-                    FOREIGN KEY (career_player_id) REFERENCES career_players (id)
-                )
-            ''')
-
-            # Career matches table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS career_matches (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    career_id INTEGER,
-                    opponent_team TEXT NOT NULL,
-                    won BOOLEAN NOT NULL,
-                    player_kills INTEGER,
-                    player_deaths INTEGER,
-                    player_assists INTEGER,
-                    match_date TEXT DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (career_id) REFERENCES careers (id)
-                )
-            ''')
-
-            # Settings table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT
-                )
-            ''')
-
-            # Insert default achievements
-            default_achievements = [
-                ("Rising Star", "Reach level 5", "⭐"),
-                ("Veteran", "Play 10 matches", "🎖️"),
-                ("Winner", "Win 5 matches", "🏆"),
-                ("Killer", "Get 50 kills", "🔪"),
-                ("Sharpshooter", "Maintain 1.5+ K/D ratio", "🎯"),
-                ("Unstoppable", "Win 10 matches in a row", "🔥")
-            ]
-
-            cursor.executemany('''
-                INSERT OR IGNORE INTO achievements (name, description, icon)
-                VALUES (?, ?, ?)
-            ''', default_achievements)
-
-            # Insert default roles
-            default_roles = [
-                ("AWPer", "Primary AWP specialist, long-range sniper", "🎯"),
-                ("Rifler", "Primary rifle user, consistent fragger", "🔫"),
-                ("IGL", "In-game leader, tactical decision maker", "👑"),
-                ("Support", "Secondary AWPer, lurker, or support role", "🛡️"),
-                ("Entry Fragger", "First to enter sites, high-risk high-reward", "💥"),
-                ("Lurker", "Map control and flanking specialist", "👤")
-            ]
-
-            cursor.executemany('''
-                INSERT OR IGNORE INTO roles (name, description, icon)
-                VALUES (?, ?, ?)
-            ''', default_roles)
-
-            # Run migrations for existing databases
-            self._run_migrations(cursor)
-
-            conn.commit()
+        """Bring the database schema up to date.
+
+        The schema version is kept in PRAGMA user_version, so a database that
+        is already current only costs that one read. Migrations run before a
+        save slot's overlay is attached, so they only touch the file's own tables.
+        """
+        with connection_pool.get(self.db_path) as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            migrations = self._migrations()
+            if version >= migrations[-1][0]:
+                return
 
-    def _run_migrations(self, cursor):
-        """Run database migrations for existing databases"""
-        try:
-            # Check if role_id column exists in players table
-            cursor.execute("PRAGMA table_info(players)")
-            columns = [row[1] for row in cursor.fetchall()]
-
-            if 'role_id' not in columns:
-                print("Migrating database: Adding role_id column to players table...")
-                cursor.execute('ALTER TABLE players ADD COLUMN role_id INTEGER REFERENCES roles(id)')
-
-            # Add team_id and role to career_players if missing
-            cursor.execute("PRAGMA table_info(career_players)")
-            cp_columns = [row[1] for row in cursor.fetchall()]
-            if 'team_id' not in cp_columns:
-                print("Migrating database: Adding team_id column to career_players table...")
-                cursor.execute('ALTER TABLE career_players ADD COLUMN team_id INTEGER')
-            if 'role' not in cp_columns:
-                print("Migrating database: Adding role column to career_players table...")
-                cursor.execute('ALTER TABLE career_players ADD COLUMN role TEXT')
-
-            # Add country_id to career_players if missing
-            cursor.execute("PRAGMA table_info(career_players)")
-            cp_columns = [row[1] for row in cursor.fetchall()]
-            if 'country_id' not in cp_columns:
-                print("Migrating database: Adding country_id column to career_players table...")
-                cursor.execute('ALTER TABLE career_players ADD COLUMN country_id INTEGER')
-
-                # Assign realistic roles to existing players
-                cursor.execute('SELECT id, name FROM players WHERE role_id IS NULL')
-                players_to_update = cursor.fetchall()
-
-                # Get all teams and their players for balanced role assignment
-                cursor.execute('SELECT team_id, COUNT(*) as player_count FROM players WHERE role_id IS NULL GROUP BY team_id')
-                team_counts = dict(cursor.fetchall())
-
-                # Assign roles using balanced algorithm
-                role_assignments = self.assign_realistic_roles(players_to_update, team_counts)
-
-                for player_id, player_name in players_to_update:
-                    role_name = role_assignments.get(player_id, "Rifler")
-                    cursor.execute('SELECT id FROM roles WHERE name = ?', (role_name,))
-                    role_row = cursor.fetchone()
-                    role_id = role_row[0] if role_row else 2  # Default to Rifler
-
-                    cursor.execute('UPDATE players SET role_id = ? WHERE id = ?', (role_id, player_id))
-
-                print(f"Migrated {len(players_to_update)} players with realistic roles")
-
-                print(f"Migrated {len(players_to_update)} players with roles")
-
-        except Exception as e:
-            print(f"Migration error: {e}")
+            cursor = conn.cursor()
+            for step_version, step in migrations:
+                if step_version <= version:
+                    continue
+                try:
+                    cursor.execute('BEGIN')
+                    step(cursor)
+                    cursor.execute(f'PRAGMA user_version = {step_version}')
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    print(f"Migration error (schema version {step_version}): {e}")
+                    return
+
+    def _migrations(self):
+        """Ordered (schema version, step) pairs. Append new steps; never change released ones."""
+        return [
+            (1, self._create_base_schema),
+            (2, self._add_legacy_columns),
+            (3, self._backfill_player_roles),
+            (4, self._create_metadata_table),
+            (5, self._create_match_history_indexes),
+            (6, self._create_box_score_tables),
+            (7, self._add_replay_columns),
+            (8, self._create_overlay_tables),
+            (9, self._add_achievement_rules),
+            (10, self._create_career_event_log),
+        ]
+
+    def _create_base_schema(self, cursor):
+        """Tables plus default achievements and roles"""
+        # Teams table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS teams (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                created_date TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Roles table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS roles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                description TEXT,
+                icon TEXT
+            )
+        ''')
+
+        # Players table (for pro players)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS players (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                rating INTEGER NOT NULL,
+                team_id INTEGER,
+                role_id INTEGER,
+                is_career_player BOOLEAN DEFAULT FALSE,
+                FOREIGN KEY (team_id) REFERENCES teams (id),
+                FOREIGN KEY (role_id) REFERENCES roles (id)
+            )
+        ''')
+
+        # Career players table (now with team_id and role)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS career_players (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                base_rating INTEGER DEFAULT 50,
+                current_rating INTEGER DEFAULT 50,
+                level INTEGER DEFAULT 1,
+                experience INTEGER DEFAULT 0,
+                experience_to_next INTEGER DEFAULT 100,
+                matches_played INTEGER DEFAULT 0,
+                wins INTEGER DEFAULT 0,
+                total_kills INTEGER DEFAULT 0,
+                total_deaths INTEGER DEFAULT 0,
+                total_assists INTEGER DEFAULT 0,
+                created_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                team_id INTEGER,
+                role TEXT,
+                country_id INTEGER
+            )
+        ''')
+
+        # Achievements table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS achievements (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                description TEXT,
+                icon TEXT
+            )
+        ''')
+
+        # Career player achievements (many-to-many)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS career_player_achievements (
+                career_player_id INTEGER,
+                achievement_id INTEGER,
+                unlocked_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (career_player_id, achievement_id),
+                FOREIGN KEY (career_player_id) REFERENCES career_players (id),
+                FOREIGN KEY (achievement_id) REFERENCES achievements (id)
+            )
+        ''')
+
+        # Careers table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS careers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_name TEXT UNIQUE NOT NULL,
+                career_player_id INTEGER,
+                created_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                last_played TEXT DEFAULT CURRENT_TIMESTAMP,
+                total_matches INTEGER DEFAULT 0,
+                tournaments_won INTEGER DEFAULT 0,
+                current_streak INTEGER DEFAULT 0,
+                best_streak INTEGER DEFAULT 0,
+                FOREIGN KEY (career_player_id) REFERENCES career_players (id)
+            )
+        ''')
+
+        # Career matches table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS career_matches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                career_id INTEGER,
+                opponent_team TEXT NOT NULL,
+                won BOOLEAN NOT NULL,
+                player_kills INTEGER,
+                player_deaths INTEGER,
+                player_assists INTEGER,
+                match_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (career_id) REFERENCES careers (id)
+            )
+        ''')
+
+        # Settings table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+
+        # Insert default achievements
+        default_achievements = [
+            ("Rising Star", "Reach level 5", "⭐"),
+            ("Veteran", "Play 10 matches", "🎖️"),
+            ("Winner", "Win 5 matches", "🏆"),
+            ("Killer", "Get 50 kills", "🔪"),
+            ("Sharpshooter", "Maintain 1.5+ K/D ratio", "🎯"),
+            ("Unstoppable", "Win 10 matches in a row", "🔥")
+        ]
+
+        cursor.executemany('''
+            INSERT OR IGNORE INTO achievements (name, description, icon)
+            VALUES (?, ?, ?)
+        ''', default_achievements)
+
+        # Insert default roles
+        default_roles = [
+            ("AWPer", "Primary AWP specialist, long-range sniper", "🎯"),
+            ("Rifler", "Primary rifle user, consistent fragger", "🔫"),
+            ("IGL", "In-game leader, tactical decision maker", "👑"),
+            ("Support", "Secondary AWPer, lurker, or support role", "🛡️"),
+            ("Entry Fragger", "First to enter sites, high-risk high-reward", "💥"),
+            ("Lurker", "Map control and flanking specialist", "👤")
+        ]
+
+        cursor.executemany('''
+            INSERT OR IGNORE INTO roles (name, description, icon)
+            VALUES (?, ?, ?)
+        ''', default_roles)
+
+    def _add_legacy_columns(self, cursor):
+        """Columns added after the first release, missing from old databases"""
+        cursor.execute("PRAGMA table_info(players)")
+        columns = [row[1] for row in cursor.fetchall()]
+        if 'role_id' not in columns:
+            print("Migrating database: Adding role_id column to players table...")
+            cursor.execute('ALTER TABLE players ADD COLUMN role_id INTEGER REFERENCES roles(id)')
+
+        cursor.execute("PRAGMA table_info(career_players)")
+        cp_columns = [row[1] for row in cursor.fetchall()]
+        if 'team_id' not in cp_columns:
+            print("Migrating database: Adding team_id column to career_players table...")
+            cursor.execute('ALTER TABLE career_players ADD COLUMN team_id INTEGER')
+        if 'role' not in cp_columns:
+            print("Migrating database: Adding role column to career_players table...")
+            cursor.execute('ALTER TABLE career_players ADD COLUMN role TEXT')
+        if 'country_id' not in cp_columns:
+            print("Migrating database: Adding country_id column to career_players table...")
+            cursor.execute('ALTER TABLE career_players ADD COLUMN country_id INTEGER')
+
+    def _backfill_player_roles(self, cursor):
+        """Assign realistic roles to players that predate the roles table"""
+        count = self._reassign_roles(cursor, only_missing=True)
+        if count:
+            print(f"Migrated {count} players with realistic roles")
+
+    def _create_metadata_table(self, cursor):
+        """Internal bookkeeping (e.g. hash of the last imported teams.json)"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+
+    def _create_match_history_indexes(self, cursor):
+        """Indexes for keyset-paginated match history, optionally filtered by opponent or result"""
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_career_matches_date
+            ON career_matches (career_id, match_date, id)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_career_matches_opponent
+            ON career_matches (career_id, opponent_team, match_date, id)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_career_matches_won
+            ON career_matches (career_id, won, match_date, id)
+        ''')
+
+    def _create_box_score_tables(self, cursor):
+        """Interned names and packed per-match box scores (see cs2_boxscore)"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS player_names (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL
+            )
+        ''')
+        # Kept out of career_matches so history listing never reads the blobs
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS career_match_box_scores (
+                match_id INTEGER PRIMARY KEY,
+                data BLOB NOT NULL,
+                FOREIGN KEY (match_id) REFERENCES career_matches (id)
+            )
+        ''')
+
+    def _add_replay_columns(self, cursor):
+        """Seed, lineups and engine version per match, enough to replay it (see replay_match)"""
+        for column, column_type in (('seed', 'INTEGER'), ('series_type', 'TEXT'),
+                                    ('roster_hash', 'TEXT'), ('engine_version', 'INTEGER')):
+            cursor.execute(f'ALTER TABLE career_matches ADD COLUMN {column} {column_type}')
+        # Lineups are shared by many matches, so each distinct one is stored once
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS roster_snapshots (
+                hash TEXT PRIMARY KEY,
+                lineups TEXT NOT NULL
+            )
+        ''')
+
+    def _create_overlay_tables(self, cursor):
+        """Save slot copies of overlaid tables and tombstones for deleted base rows (see attach_base).
+
+        Only save slots get them; a base database is never overlaid.
+        """
+        if self.base_db_path is None:
+            return
+        for table in OVERLAY_TABLES:
+            # Same columns, types and defaults as the table itself; ids are always given by the triggers
+            columns = []
+            for _, name, column_type, not_null, default, pk in cursor.execute(f'PRAGMA main.table_info({table})'):
+                column = f'"{name}" {column_type}'
+                if pk:
+                    column += ' PRIMARY KEY'
+                if not_null:
+                    column += ' NOT NULL'
+                if default is not None:
+                    column += f' DEFAULT {default}'
+                columns.append(column)
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS slot_{table} ({", ".join(columns)})')
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS slot_removed_{table} (id INTEGER PRIMARY KEY)')
+
+    def _add_achievement_rules(self, cursor):
+        """Each achievement unlocks once a player stat reaches a threshold (see career_system.AchievementRules)"""
+        cursor.execute('ALTER TABLE achievements ADD COLUMN stat TEXT')
+        cursor.execute('ALTER TABLE achievements ADD COLUMN threshold REAL')
+        cursor.executemany('UPDATE achievements SET stat = ?, threshold = ? WHERE name = ?', [
+            ("level", 5, "Rising Star"),
+            ("matches_played", 10, "Veteran"),
+            ("wins", 5, "Winner"),
+            ("total_kills", 50, "Killer"),
+            ("kdr", 1.5, "Sharpshooter"),
+            ("win_streak", 10, "Unstoppable"),
+        ])
+
+    def _create_career_event_log(self, cursor):
+        """Append-only career events, plus full state snapshots to replay them from"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS career_events (
+                id INTEGER PRIMARY KEY,
+                career_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (career_id, seq)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS career_snapshots (
+                career_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                PRIMARY KEY (career_id, seq)
+            )
+        ''')
 
     # Team and Player Management
     def get_player_role_mapping(self):
@@ -294,9 +540,14 @@ class CS2Database:
             "kyousuke": "Support"
         }
 
-    def assign_realistic_roles(self, players, team_counts):
-        """Assign realistic roles to players based on team composition needs"""
-        import random
+    def assign_realistic_roles(self, players, rng=None) -> Dict[int, str]:
+        """Assign realistic roles to players based on team composition needs.
+
+        players are (id, name, team_id) rows; returns {player id: role name}.
+        Runs entirely in memory, so pass a seeded random.Random for
+        repeatable assignments.
+        """
+        rng = rng or random.Random()
 
         # Role priorities for balanced teams
         role_priorities = {
@@ -312,46 +563,33 @@ class CS2Database:
 
         # Group players by team
         players_by_team = {}
-        for player_id, player_name in players:
-            # Get team_id for this player
-            with self.get_connection() as temp_conn:
-                temp_cursor = temp_conn.cursor()
-                temp_cursor.execute('SELECT team_id FROM players WHERE id = ?', (player_id,))
-                team_id = temp_cursor.fetchone()[0]
-
-            if team_id not in players_by_team:
-                players_by_team[team_id] = []
-            players_by_team[team_id].append((player_id, player_name))
+        for player_id, player_name, team_id in players:
+            players_by_team.setdefault(team_id, []).append((player_id, player_name))
 
         # Assign roles for each team
-        for team_id, team_players in players_by_team.items():
-            team_size = len(team_players)
-            assigned_roles = {role: 0 for role in role_priorities.keys()}
+        for team_players in players_by_team.values():
+            assigned_roles = dict.fromkeys(role_priorities, 0)
 
             # First, assign famous players their known roles
+            remaining_players = []
             for player_id, player_name in team_players:
-                if player_name in famous_players:
-                    role = famous_players[player_name]
+                role = famous_players.get(player_name)
+                if role is None:
+                    remaining_players.append(player_id)
+                else:
                     assignments[player_id] = role
                     assigned_roles[role] += 1
 
             # Then assign remaining players based on team needs
-            remaining_players = [(pid, name) for pid, name in team_players if pid not in assignments]
-
-            for player_id, player_name in remaining_players:
-                # Find the role that this team needs most
-                available_roles = []
-                for role, max_count in role_priorities.items():
-                    if assigned_roles[role] < max_count:
-                        available_roles.append((role, max_count - assigned_roles[role]))
+            for player_id in remaining_players:
+                # Weight each role by how much the team still needs it
+                available_roles = [(role, max_count - assigned_roles[role])
+                                   for role, max_count in role_priorities.items()
+                                   if assigned_roles[role] < max_count]
 
                 if available_roles:
-                    # Weight by how much the role is needed
-                    role_weights = [(role, need) for role, need in available_roles]
-                    selected_role = random.choices(
-                        [r for r, w in role_weights],
-                        weights=[w for r, w in role_weights]
-                    )[0]
+                    selected_role = rng.choices([r for r, _ in available_roles],
+                                                weights=[w for _, w in available_roles])[0]
                     assignments[player_id] = selected_role
                     assigned_roles[selected_role] += 1
                 else:
@@ -360,51 +598,92 @@ class CS2Database:
 
         return assignments
 
+    def _reassign_roles(self, cursor, only_missing: bool = True, seed: Optional[int] = None) -> int:
+        """Fetch players once, assign roles in memory and write them back with one executemany"""
+        where = ' WHERE role_id IS NULL' if only_missing else ''
+        cursor.execute(f'SELECT id, name, team_id FROM players{where} ORDER BY team_id, id')
+        players = cursor.fetchall()
+        if not players:
+            return 0
+
+        assignments = self.assign_realistic_roles(players, random.Random(seed))
+        cursor.execute('SELECT name, id FROM roles')
+        role_ids = dict(cursor.fetchall())
+        rifler_id = role_ids.get("Rifler", 2)  # Default to Rifler
+        cursor.executemany('UPDATE players SET role_id = ? WHERE id = ?',
+                           [(role_ids.get(assignments.get(player_id), rifler_id), player_id)
+                            for player_id, _, _ in players])
+        return len(players)
+
+    def reassign_player_roles(self, only_missing: bool = False, seed: Optional[int] = None) -> int:
+        """Reassign realistic roles to every player (or only those without one), in one transaction"""
+        with self.get_connection() as conn:
+            count = self._reassign_roles(conn.cursor(), only_missing, seed)
+            conn.commit()
+            return count
+
     def load_teams_from_json(self, json_file: str = "teams.json") -> Dict:
-        """Load teams from JSON file and store in database"""
+        """Load teams from JSON file and store in database.
+
+        The import is skipped when the file (and the role mapping) hashes the
+        same as the last import. Otherwise the pro players in the database are
+        diffed against the file and only changed rows are written.
+        """
         if not os.path.exists(json_file):
             return {}
 
-        with open(json_file, 'r') as f:
-            data = json.load(f)
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw)
 
         teams_dict = data.get("teams", {})
         player_roles = self.get_player_role_mapping()
+        digest = hashlib.sha1(raw + json.dumps(player_roles, sort_keys=True).encode("utf-8")).hexdigest()
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
-
-            # Clear existing pro players (not career players)
-            cursor.execute('DELETE FROM players WHERE is_career_player = FALSE')
-            print(f"Cleared existing pro players from database")
-
+            cursor.execute("SELECT value FROM metadata WHERE key = 'teams_json_hash'")
+            row = cursor.fetchone()
+            if row and row[0] == digest:
+                return teams_dict
+
+            # Get or create teams
+            cursor.execute('SELECT name, id FROM teams')
+            team_ids = dict(cursor.fetchall())
+            cursor.executemany('INSERT INTO teams (name) VALUES (?)',
+                               [(name,) for name in teams_dict if name not in team_ids])
+            cursor.execute('SELECT name, id FROM teams')
+            team_ids = dict(cursor.fetchall())
+
+            cursor.execute('SELECT name, id FROM roles')
+            role_ids = dict(cursor.fetchall())
+            rifler_id = role_ids.get("Rifler", 2)  # Default to Rifler
+
+            wanted = {}
             for team_name, players in teams_dict.items():
-                # Get or create team
-                cursor.execute('SELECT id FROM teams WHERE name = ?', (team_name,))
-                existing_team = cursor.fetchone()
-
-                if existing_team:
-                    team_id = existing_team[0]
-                else:
-                    cursor.execute('INSERT INTO teams (name) VALUES (?)', (team_name,))
-                    team_id = cursor.lastrowid
-
-                # Insert players with roles
                 for player in players:
-                    player_name = player["name"]
-                    role_name = player_roles.get(player_name, "Rifler")  # Default to Rifler
-
-                    # Get role ID
-                    cursor.execute('SELECT id FROM roles WHERE name = ?', (role_name,))
-                    role_row = cursor.fetchone()
-                    role_id = role_row[0] if role_row else 2  # Default to Rifler (ID 2)
-
-                    cursor.execute('''
-                        INSERT INTO players (name, rating, team_id, role_id, is_career_player)
-                        VALUES (?, ?, ?, ?, FALSE)
-                    ''', (player_name, player["rating"], team_id, role_id))
-
+                    role_id = role_ids.get(player_roles.get(player["name"], "Rifler"), rifler_id)
+                    wanted[(team_ids[team_name], player["name"])] = (player["rating"], role_id)
+
+            cursor.execute('SELECT id, team_id, name, rating, role_id FROM players WHERE is_career_player = FALSE')
+            removed, updated = [], []
+            for player_id, team_id, name, rating, role_id in cursor.fetchall():
+                target = wanted.pop((team_id, name), None)
+                if target is None:
+                    removed.append((player_id,))
+                elif target != (rating, role_id):
+                    updated.append(target + (player_id,))
+            added = [(name, rating, team_id, role_id) for (team_id, name), (rating, role_id) in wanted.items()]
+
+            cursor.executemany('DELETE FROM players WHERE id = ?', removed)
+            cursor.executemany('UPDATE players SET rating = ?, role_id = ? WHERE id = ?', updated)
+            cursor.executemany('''
+                INSERT INTO players (name, rating, team_id, role_id, is_career_player)
+                VALUES (?, ?, ?, ?, FALSE)
+            ''', added)
+            cursor.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('teams_json_hash', ?)", (digest,))
             conn.commit()
+            print(f"Imported {json_file}: {len(added)} added, {len(updated)} updated, {len(removed)} removed players")
 
         return teams_dict
 
@@ -437,57 +716,97 @@ class CS2Database:
 
             return teams_dict
 
-    # Career Player Management
-    def save_career_player(self, career_player) -> int:
-        """Save career player to database (now with team_id and role)"""
+    def get_team_rosters(self) -> Dict[str, List[Tuple[str, int]]]:
+        """Get every team's full lineup as (player name, rating) pairs, career players included"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-
-            # Insert or update career player
             cursor.execute('''
-                INSERT OR REPLACE INTO career_players
-                (name, base_rating, current_rating, level, experience, experience_to_next,
-                 matches_played, wins, total_kills, total_deaths, total_assists, created_date, team_id, role, country_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                career_player.name,
-                career_player.base_rating,
-                career_player.current_rating,
-                career_player.level,
-                career_player.experience,
-                career_player.experience_to_next,
-                career_player.matches_played,
-                career_player.wins,
-                career_player.total_kills,
-                career_player.total_deaths,
-                career_player.total_assists,
-                career_player.created_date,
-                career_player.team_id,
-                career_player.role,
-                career_player.country_id
-            ))
-
-            career_player_id = cursor.lastrowid if cursor.lastrowid != 0 else cursor.execute('SELECT id FROM career_players WHERE name = ?', (career_player.name,)).fetchone()[0]
-
-            # Update achievements
-            cursor.execute('DELETE FROM career_player_achievements WHERE career_player_id = ?',
-                         (career_player_id,))
-
-            for achievement in career_player.achievements:
-                cursor.execute('SELECT id FROM achievements WHERE name = ?', (achievement,))
-                achievement_row = cursor.fetchone()
-                if achievement_row:
-                    cursor.execute('''
-                        INSERT INTO career_player_achievements (career_player_id, achievement_id)
-                        VALUES (?, ?)
-                    ''', (career_player_id, achievement_row[0]))
+                SELECT t.name, p.name, p.rating
+                FROM teams t
+                JOIN players p ON t.id = p.team_id
+                ORDER BY t.name, p.name
+            ''')
 
-            conn.commit()
+            rosters = {}
+            for team_name, player_name, rating in cursor.fetchall():
+                rosters.setdefault(team_name, []).append((player_name, rating))
+            return rosters
+
+    # Career Player Management
+    def save_career_player(self, career_player) -> int:
+        """Save career player to database (now with team_id and role)"""
+        with self.get_connection() as conn:
+            try:
+                career_player_id = self._write_career_player(conn.cursor(), career_player)
+                conn.commit()
+            except Exception:
+                career_player.forget_saved(self._key)
+                raise
             return career_player_id
 
+    def _write_tracked(self, cursor, table: str, key_column: str, key: str, obj,
+                       extra: Optional[Dict] = None) -> int:
+        """Write obj's persisted fields (plus extra columns) to its row in table; returns the row id.
+
+        The first write of an object to this file is an upsert on key_column,
+        which keeps an existing row and its id. After that only the columns
+        that changed since the last load or save are updated, by id, and a
+        clean object costs no statement at all.
+        """
+        state = obj.persisted_state()
+        state.update(extra or {})
+        saved = obj.saved_state(self._key)
+        if saved is None:
+            columns = [key_column] + list(state)
+            cursor.execute(f'''
+                INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})
+                ON CONFLICT ({key_column}) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in state)}
+            ''', [key] + list(state.values()))
+            row_id = cursor.execute(f'SELECT id FROM {table} WHERE {key_column} = ?', (key,)).fetchone()[0]
+        else:
+            row_id, saved_values = saved
+            changed = {column: value for column, value in state.items() if saved_values.get(column) != value}
+            if changed:
+                cursor.execute(f'''
+                    UPDATE {table} SET {', '.join(f'{column} = ?' for column in changed)} WHERE id = ?
+                ''', list(changed.values()) + [row_id])
+        obj.mark_saved(self._key, row_id, state)
+        return row_id
+
+    def _forget_saved(self, career):
+        """After a rolled back write the in-memory career no longer matches the file"""
+        career.forget_saved(self._key)
+        career.player.forget_saved(self._key)
+
+    def _write_career_player(self, cursor, career_player) -> int:
+        """Save a career player's changed columns and new achievements, without committing"""
+        career_player_id = self._write_tracked(cursor, 'career_players', 'name', career_player.name, career_player)
+
+        # Unlocks are permanent, so only the new ones are appended
+        unsaved = career_player.unsaved_achievements(self._key)
+        if unsaved:
+            cursor.execute('SELECT name, id FROM achievements')
+            achievement_ids = dict(cursor.fetchall())
+            cursor.executemany('''
+                INSERT OR IGNORE INTO career_player_achievements (career_player_id, achievement_id, unlocked_date)
+                VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            ''', [(career_player_id, achievement_ids[name], date)
+                  for name, date in unsaved.items() if name in achievement_ids])
+            career_player.mark_achievements_saved(self._key, unsaved)
+
+        return career_player_id
+
+    def get_achievement_rules(self) -> List[Tuple[str, str, float]]:
+        """(name, stat, threshold) of every rule-based achievement"""
+        if self._achievement_rules is None:
+            with self.get_connection() as conn:
+                self._achievement_rules = conn.execute(
+                    'SELECT name, stat, threshold FROM achievements WHERE stat IS NOT NULL ORDER BY id').fetchall()
+        return self._achievement_rules
+
     def load_career_player(self, name: str):
         """Load career player from database (now with team_id and role)"""
-        from career_system import CareerPlayer
+        from career_system import AchievementRules, CareerPlayer
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -515,49 +834,193 @@ class CS2Database:
             player.created_date = row[12]
             player.country_id = country_val
 
-            # Load achievements
+            # Load achievements in unlock order (rows are only ever appended)
             cursor.execute('''
-                SELECT a.name FROM achievements a
-                JOIN career_player_achievements cpa ON a.id = cpa.achievement_id
+                SELECT a.name, cpa.unlocked_date FROM career_player_achievements cpa
+                JOIN achievements a ON a.id = cpa.achievement_id
                 WHERE cpa.career_player_id = ?
+                ORDER BY cpa.rowid
             ''', (row[0],))
 
-            player.achievements = [row[0] for row in cursor.fetchall()]
+            player.achievements = []
+            player.unlocked.update(cursor.fetchall())
+            player.mark_achievements_saved(self._key, player.unlocked)
+            player.mark_saved(self._key, row[0], player.persisted_state())
+            player.set_achievement_rules(AchievementRules(self.get_achievement_rules()))
 
             return player
 
     # Career Management
     def save_career(self, career) -> int:
         """Save career to database"""
+        with self.get_connection() as conn:
+            try:
+                career_id = self._write_career(conn.cursor(), career)
+                conn.commit()
+            except Exception:
+                self._forget_saved(career)
+                raise
+            return career_id
+
+    def _write_career(self, cursor, career) -> int:
+        """Save a career and its player's changed columns, without committing"""
+        before = (career.saved_state(self._key), career.player.saved_state(self._key))
+        # Fresh objects and edits the pending events don't explain are not in the log, only in a snapshot
+        untracked = (None in before or
+                     career.replay_persisted(before[0][1], before[1][1], career.pending_events) !=
+                     (career.persisted_state(), career.player.persisted_state()))
+        # Save career player first
+        career_player_id = self._write_career_player(cursor, career.player)
+        career_id = self._write_tracked(cursor, 'careers', 'player_name', career.player_name, career,
+                                        {"career_player_id": career_player_id})
+        self._append_career_events(cursor, career_id, career, untracked)
+        return career_id
+
+    def _append_career_events(self, cursor, career_id: int, career, snapshot: bool = False):
+        """Append the career's pending events and snapshot it when due, without committing.
+
+        A career is snapshotted when asked to, on its first write and then
+        whenever CAREER_SNAPSHOT_EVERY events have been appended since the
+        last snapshot, so load_career never replays more than about that many
+        events (plus one write's worth).
+        """
+        events = career.pending_events
+        last_seq, snapshot_seq = cursor.execute('''
+            SELECT (SELECT MAX(seq) FROM career_events WHERE career_id = ?),
+                   (SELECT MAX(seq) FROM career_snapshots WHERE career_id = ?)
+        ''', (career_id, career_id)).fetchone()
+        last_seq = last_seq or 0
+        if events:
+            cursor.executemany('INSERT INTO career_events (career_id, seq, type, data) VALUES (?, ?, ?, ?)',
+                               [(career_id, last_seq + i, event_type, json.dumps(data, separators=(',', ':')))
+                                for i, (event_type, data) in enumerate(events, 1)])
+            last_seq += len(events)
+            events.clear()
+        if snapshot or snapshot_seq is None or last_seq - snapshot_seq >= CAREER_SNAPSHOT_EVERY:
+            cursor.execute('INSERT OR REPLACE INTO career_snapshots (career_id, seq, state) VALUES (?, ?, ?)',
+                           (career_id, last_seq, json.dumps(career.snapshot(), separators=(',', ':'))))
+
+    def record_career_match(self, career, opponent_team: str, won: bool, player_stats: Dict,
+                            result=None) -> int:
+        """Apply a match result to career and persist it as one unit of work.
+
+        The career/player aggregates, achievement changes and the match row
+        are written in a single transaction with one commit; if anything
+        fails nothing is written. When a SeriesResult is given, a seeded one
+        is kept as its seed, lineup hash and engine version (see
+        replay_match) and any other as a packed box score. Returns the new
+        career_matches id.
+        """
+        career.add_match_result(opponent_team, won, player_stats)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                career_id = self._write_career(cursor, career)
+                match_id = self._insert_career_match(cursor, career_id, opponent_team, won, player_stats, result)
+                conn.commit()
+            except Exception:
+                self._forget_saved(career)
+                raise
+            return match_id
+
+    def record_career_matches(self, career, matches) -> int:
+        """Persist matches already applied to career in memory, in one transaction.
+
+        matches is a list of (opponent_team, won, player_stats, result)
+        tuples as for record_career_match. The career row is written once for
+        the whole batch. Returns the number of matches written.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            try:
+                career_id = self._write_career(cursor, career)
+                for opponent_team, won, player_stats, result in matches:
+                    self._insert_career_match(cursor, career_id, opponent_team, won, player_stats, result)
+                conn.commit()
+            except Exception:
+                self._forget_saved(career)
+                raise
+            return len(matches)
+
+    def _insert_career_match(self, cursor, career_id: int, opponent_team: str, won: bool,
+                             player_stats: Dict, result=None) -> int:
+        seeded = result is not None and result.seed is not None
+        replay = (None, None, None, None)
+        if seeded:
+            roster_hash = lineups_hash(result.lineups)
+            cursor.execute('INSERT OR IGNORE INTO roster_snapshots (hash, lineups) VALUES (?, ?)',
+                           (roster_hash, result.lineups))
+            replay = (result.seed, result.series_type, roster_hash, ENGINE_VERSION)
+        cursor.execute('''
+            INSERT INTO career_matches
+            (career_id, opponent_team, won, player_kills, player_deaths, player_assists,
+             seed, series_type, roster_hash, engine_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (career_id, opponent_team, won, player_stats.get("kills", 0),
+              player_stats.get("deaths", 0), player_stats.get("assists", 0)) + replay)
+        match_id = cursor.lastrowid
+        if result is not None and not seeded:
+            name_ids = self._intern_names(cursor, box_score_names(result))
+            cursor.execute('INSERT INTO career_match_box_scores (match_id, data) VALUES (?, ?)',
+                           (match_id, encode_box_score(result, name_ids)))
+        return match_id
+
+    def replay_match(self, match_id: int):
+        """Regenerate the full SeriesResult of a seeded match, or None if it has no seed.
+
+        Raises ValueError if the match was played on a different ENGINE_VERSION,
+        since the same seed would no longer give the same series.
+        """
+        with self.get_connection() as conn:
+            row = conn.execute('''
+                SELECT m.seed, m.series_type, m.engine_version, s.lineups
+                FROM career_matches m JOIN roster_snapshots s ON s.hash = m.roster_hash
+                WHERE m.id = ? AND m.seed IS NOT NULL
+            ''', (match_id,)).fetchone()
+        if not row:
+            return None
+        seed, series_type, engine_version, lineups = row
+        if engine_version != ENGINE_VERSION:
+            raise ValueError(f"Match {match_id} was played on engine version {engine_version}, "
+                             f"current is {ENGINE_VERSION}")
+        (team1_name, roster1), (team2_name, roster2) = json.loads(lineups)
+        return play_series(Team.from_roster(team1_name, roster1), Team.from_roster(team2_name, roster2),
+                           series_type, seed=seed)
+
+    def _intern_names(self, cursor, names) -> Dict[str, int]:
+        """Ids for names in player_names, adding any that are new"""
+        names = list(dict.fromkeys(names))
+        placeholders = ', '.join('?' * len(names))
+        query = f'SELECT name, id FROM player_names WHERE name IN ({placeholders})'
+        ids = dict(cursor.execute(query, names).fetchall())
+        missing = [(name,) for name in names if name not in ids]
+        if missing:
+            cursor.executemany('INSERT INTO player_names (name) VALUES (?)', missing)
+            ids = dict(cursor.execute(query, names).fetchall())
+        return ids
+
+    def get_career_match_box_score(self, match_id: int):
+        """Full box score of a recorded match as a SeriesResult, or None if it wasn't stored"""
+        with self.get_connection() as conn:
+            row = conn.execute('SELECT data FROM career_match_box_scores WHERE match_id = ?', (match_id,)).fetchone()
+            if not row:
+                return None
 
-            # Save career player first
-            career_player_id = self.save_career_player(career.player)
+            def resolve_names(ids):
+                ids = list(ids)
+                placeholders = ', '.join('?' * len(ids))
+                return dict(conn.execute(f'SELECT id, name FROM player_names WHERE id IN ({placeholders})',
+                                         ids).fetchall())
 
-            # Save career
-            cursor.execute('''
-                INSERT OR REPLACE INTO careers
-                (player_name, career_player_id, created_date, last_played, total_matches,
-                 tournaments_won, current_streak, best_streak)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                career.player_name,
-                career_player_id,
-                career.created_date,
-                career.last_played,
-                career.total_matches,
-                career.tournaments_won,
-                career.current_streak,
-                career.best_streak
-            ))
-
-            career_id = cursor.lastrowid
-            conn.commit()
-            return career_id
+            return decode_box_score(row[0], resolve_names)
 
-    def load_career(self, player_name: str):
-        """Load career from database"""
+    def load_career(self, player_name: str, at_seq: Optional[int] = None):
+        """Load career from database.
+
+        Careers with an event log are rebuilt from their latest snapshot plus
+        the events after it. With at_seq, the career is rebuilt as it was
+        right after event at_seq instead (None if no snapshot is that old).
+        """
         from career_system import Career, CareerPlayer
 
         with self.get_connection() as conn:
@@ -569,19 +1032,65 @@ class CS2Database:
             if not row:
                 return None
 
+            career = self._replay_career(cursor, row[0], at_seq)
+            if at_seq is not None:
+                return career
+            if career is not None:
+                self._mark_loaded(career, row[0], row[2], cursor)
+                return career
+
             career = Career(row[1])  # player_name
+            # Load career player (the win streak lives on it)
+            career.player = self.load_career_player(player_name) or career.player
             career.created_date = row[3]
             career.last_played = row[4]
             career.total_matches = row[5]
             career.tournaments_won = row[6]
             career.current_streak = row[7]
             career.best_streak = row[8]
-
-            # Load career player
-            career.player = self.load_career_player(player_name)
+            career.mark_saved(self._key, row[0], dict(career.persisted_state(), career_player_id=row[2]))
 
             return career
 
+    def _replay_career(self, cursor, career_id: int, at_seq: Optional[int] = None):
+        """Latest snapshot at or before at_seq plus the events after it, or None without a snapshot"""
+        from career_system import Career
+
+        snapshot = cursor.execute('''
+            SELECT seq, state FROM career_snapshots WHERE career_id = ? AND (? IS NULL OR seq <= ?)
+            ORDER BY seq DESC LIMIT 1
+        ''', (career_id, at_seq, at_seq)).fetchone()
+        if snapshot is None:
+            return None
+        career = Career.from_snapshot(json.loads(snapshot[1]))
+        for event_type, data in cursor.execute('''
+            SELECT type, data FROM career_events
+            WHERE career_id = ? AND seq > ? AND (? IS NULL OR seq <= ?) ORDER BY seq
+        ''', (career_id, snapshot[0], at_seq, at_seq)):
+            career.apply_event(event_type, json.loads(data))
+        return career
+
+    def _mark_loaded(self, career, career_id: int, career_player_id: int, cursor):
+        """A replayed career matches its rows, which are written with its events"""
+        from career_system import AchievementRules
+
+        player = career.player
+        player.mark_achievements_saved(self._key, player.unlocked)
+        player.mark_saved(self._key, career_player_id, player.persisted_state())
+        player.set_achievement_rules(AchievementRules(self.get_achievement_rules()))
+        career.mark_saved(self._key, career_id,
+                          dict(career.persisted_state(), career_player_id=career_player_id))
+
+    def get_career_events(self, career_id: int, after_seq: int = 0, limit: int = 1000) -> List[Dict]:
+        """Logged events of a career after after_seq, oldest first"""
+        with self.get_connection() as conn:
+            rows = conn.execute('''
+                SELECT seq, type, data, created_date FROM career_events
+                WHERE career_id = ? AND seq > ? ORDER BY seq LIMIT ?
+            ''', (career_id, after_seq, limit)).fetchall()
+        return [{"seq": seq, "type": event_type, "data": json.loads(data), "created_date": created}
+                for seq, event_type, data, created in rows]
+
     def list_careers(self) -> List[str]:
         """List all career player names"""
         with self.get_connection() as conn:
@@ -603,27 +1112,66 @@ class CS2Database:
 
     def get_career_match_history(self, career_id: int, limit: int = 10) -> List[Dict]:
         """Get recent match history for a career"""
+        return self.get_career_match_page(career_id, page_size=limit)[0]
+
+    @staticmethod
+    def _match_filters(career_id: int, opponent: Optional[str], won: Optional[bool]) -> Tuple[str, list]:
+        clauses = ['career_id = ?']
+        params = [career_id]
+        if opponent is not None:
+            clauses.append('opponent_team = ?')
+            params.append(opponent)
+        if won is not None:
+            clauses.append('won = ?')
+            params.append(won)
+        return ' AND '.join(clauses), params
+
+    def get_career_match_page(self, career_id: int, after: Optional[Tuple[str, int]] = None,
+                              page_size: int = 50, opponent: Optional[str] = None,
+                              won: Optional[bool] = None) -> Tuple[List[Dict], Optional[Tuple[str, int]]]:
+        """Get one page of match history, newest first.
+
+        after is the (match_date, id) cursor returned with the previous page,
+        so every page is an index seek no matter how deep it is. Returns
+        (matches, next_cursor); next_cursor is None on the last page.
+        """
+        where, params = self._match_filters(career_id, opponent, won)
+        if after is not None:
+            where += ' AND (match_date, id) < (?, ?)'
+            params += list(after)
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT opponent_team, won, player_kills, player_deaths, player_assists, match_date
+            cursor.execute(f'''
+                SELECT id, opponent_team, won, player_kills, player_deaths, player_assists, match_date
                 FROM career_matches
-                WHERE career_id = ?
-                ORDER BY match_date DESC
+                WHERE {where}
+                ORDER BY match_date DESC, id DESC
                 LIMIT ?
-            ''', (career_id, limit))
+            ''', params + [page_size])
 
             matches = []
             for row in cursor.fetchall():
                 matches.append({
-                    "opponent": row[0],
-                    "won": bool(row[1]),
-                    "kills": row[2],
-                    "deaths": row[3],
-                    "assists": row[4],
-                    "date": row[5]
+                    "id": row[0],
+                    "opponent": row[1],
+                    "won": bool(row[2]),
+                    "kills": row[3],
+                    "deaths": row[4],
+                    "assists": row[5],
+                    "date": row[6]
                 })
-            return matches
+        next_cursor = (matches[-1]["date"], matches[-1]["id"]) if len(matches) == page_size else None
+        return matches, next_cursor
+
+    def count_career_matches(self, career_id: int, opponent: Optional[str] = None,
+                             won: Optional[bool] = None) -> Dict[str, int]:
+        """Count matches, wins and losses for a career in one query (same filters as get_career_match_page)"""
+        where, params = self._match_filters(career_id, opponent, won)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT COUNT(*), COALESCE(SUM(won), 0) FROM career_matches WHERE {where}', params)
+            matches, wins = cursor.fetchone()
+            return {"matches": matches, "wins": wins, "losses": matches - wins}
 
     # Settings Management
     def save_setting(self, key: str, value: str):
@@ -650,10 +1198,21 @@ class CS2Database:
             return {row[0]: row[1] for row in cursor.fetchall()}
 
     # Utility methods
-    def backup_database(self, backup_path: str):
-        """Create a backup of the database"""
-        import shutil
-        shutil.copy2(self.db_path, backup_path)
+    def backup_database(self, backup_path: str, pages: int = BACKUP_PAGES_PER_STEP, progress=None,
+                        background: bool = False):
+        """Create a consistent backup of the live database with the SQLite backup API.
+
+        Copies pages per step and calls progress(copied_pages, total_pages)
+        after each one. With background=True the copy runs on its own thread
+        and the started BackupJob is returned.
+        """
+        if background:
+            return BackupJob(self.db_path, backup_path, pages, progress).start()
+        return online_backup(self.db_path, backup_path, pages, progress)
+
+    def schedule_backups(self, backup_dir: str, interval: float, keep: int = 5) -> BackupScheduler:
+        """Start rolling backups every interval seconds, keeping the newest keep files"""
+        return BackupScheduler(self.db_path, backup_dir, interval, keep).start()
 
     def get_database_stats(self) -> Dict:
         """Get database statistics"""
@@ -686,6 +1245,5 @@ class CS2Database:
             cursor = conn.cursor()
             cursor.execute('SELECT id, name FROM teams WHERE id BETWEEN ? AND ?', (min_id, max_id))
             teams = cursor.fetchall()
-        import random
         offers = random.sample(teams, min(count, len(teams))) if teams else []
         return offers
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Pairwise matchup-probability matrix for every team in the database.
+
+Probabilities come from cs2_analytic and are cached on disk next to the
+database, keyed by a hash of each team's roster. A refresh only recomputes
+the rows and columns of teams whose roster changed (for example after
+replace_player_with_role_in_team puts a career player into a lineup).
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from cs2_analytic import rating_odds
+
+CACHE_VERSION = 1
+ODDS_KEYS = ("map", "BO1", "BO3", "BO5")
+PARALLEL_MIN_PAIRS = 200  # Below this a process pool costs more than it saves
+
+
+def roster_hash(roster) -> str:
+    """Content hash of a roster, independent of player order"""
+    payload = json.dumps(sorted([name, rating] for name, rating in roster))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def roster_profile(roster) -> Tuple[float, int]:
+    """(average rating, player count), all the round model depends on"""
+    return sum(rating for _, rating in roster) / len(roster), len(roster)
+
+
+def compute_pairs(pairs) -> List[Dict[str, float]]:
+    """Odds for a list of ((rating1, players1), (rating2, players2)) pairs"""
+    results = []
+    for (rating1, players1), (rating2, players2) in pairs:
+        odds = rating_odds(rating1, rating2, players1, players2)
+        results.append({key: odds[key] for key in ODDS_KEYS})
+    return results
+
+
+class MatchupMatrix:
+    """N x N map/BO1/BO3/BO5 win probabilities for all teams in a CS2Database"""
+    def __init__(self, db, cache_path: Optional[str] = None, workers: Optional[int] = None):
+        self.db = db
+        self.cache_path = cache_path or os.path.splitext(db.db_path)[0] + "_matchups.json"
+        self.workers = workers
+        self.hashes = {}
+        self.matrix = {}
+        self._load_cache()
+
+    def _load_cache(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.hashes = data.get("hashes", {})
+            self.matrix = data.get("matrix", {})
+
+    def _save_cache(self):
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": CACHE_VERSION, "hashes": self.hashes, "matrix": self.matrix}, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _compute(self, pairs) -> List[Dict[str, float]]:
+        workers = self.workers or os.cpu_count() or 1
+        if workers == 1 or len(pairs) < PARALLEL_MIN_PAIRS:
+            return compute_pairs(pairs)
+        size = -(-len(pairs) // workers)
+        batches = [pairs[i:i + size] for i in range(0, len(pairs), size)]
+        with ProcessPoolExecutor(max_workers=len(batches)) as pool:
+            return [odds for batch in pool.map(compute_pairs, batches) for odds in batch]
+
+    def refresh(self) -> int:
+        """Bring the matrix up to date with the database; returns the number of pairs recomputed"""
+        rosters = {name: roster for name, roster in self.db.get_team_rosters().items() if roster}
+        hashes = {name: roster_hash(roster) for name, roster in rosters.items()}
+        changed = {name for name, h in hashes.items() if self.hashes.get(name) != h}
+
+        # Drop teams that no longer exist and every cell involving a changed roster
+        matrix = {}
+        for team1, row in self.matrix.items():
+            if team1 in hashes and team1 not in changed:
+                matrix[team1] = {team2: odds for team2, odds in row.items()
+                                 if team2 in hashes and team2 not in changed}
+
+        names = sorted(hashes)
+        todo = [(team1, team2) for i, team1 in enumerate(names) for team2 in names[i + 1:]
+                if team1 in changed or team2 in changed]
+        profiles = {name: roster_profile(rosters[name]) for name in names}
+        results = self._compute([(profiles[team1], profiles[team2]) for team1, team2 in todo])
+
+        for (team1, team2), odds in zip(todo, results):
+            matrix.setdefault(team1, {})[team2] = odds
+            # Every outcome has exactly one winner, so the reverse cell is the complement
+            matrix.setdefault(team2, {})[team1] = {key: 1 - value for key, value in odds.items()}
+
+        self.matrix = matrix
+        self.hashes = hashes
+        if todo or changed or len(self.matrix) != len(names):
+            self._save_cache()
+        return len(todo)
+
+    def teams(self) -> List[str]:
+        return sorted(self.hashes)
+
+    def probability(self, team1: str, team2: str, series_type: str = "map") -> float:
+        """P(team1 beats team2) for "map", "BO1", "BO3" or "BO5" """
+        if team1 == team2:
+            return 0.5
+        return self.matrix[team1][team2][series_type]
+
+    def table(self, series_type: str = "map") -> Dict[str, Dict[str, float]]:
+        """Full matrix for one format as {team1: {team2: probability}}"""
+        return {team1: {team2: self.probability(team1, team2, series_type) for team2 in self.teams()}
+                for team1 in self.teams()}
@@ -0,0 +1,192 @@
+"""
+Parallel Monte Carlo runner for series simulations.
+
+Spreads N simulate_series runs for one matchup over a process pool. Work is
+split into fixed-size chunks, and each chunk gets its own random.Random seeded
+from (master seed, chunk index) and its own copies of the Player/Team objects.
+The merged report therefore depends only on the master seed and N, never on
+the number of workers.
+"""
+import math
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+from cs2_simulator import Team, play_series
+
+CHUNK_SIZE = 250  # Series per task; fixed so results never depend on the worker count
+
+
+def team_snapshot(team) -> Tuple[str, Tuple[Tuple[str, float], ...]]:
+    """Picklable (name, ((player, rating), ...)) description of a team"""
+    return team.name, tuple((p.name, p.rating) for p in team.players)
+
+
+def build_team(snapshot) -> Team:
+    """Create fresh Team/Player objects from a team_snapshot"""
+    name, players = snapshot
+    return Team.from_roster(name, players)
+
+
+def chunk_rng(seed: int, chunk_index: int) -> random.Random:
+    """Independent random stream for one chunk of a run"""
+    return random.Random(f"{seed}:{chunk_index}")
+
+
+def _empty_totals(team) -> List[List[int]]:
+    return [[0, 0, 0] for _ in team.players]
+
+
+def run_chunk(team1_snapshot, team2_snapshot, series_type: str, seed: int, chunk_index: int,
+              count: int) -> Dict:
+    """Simulate one chunk of series and return its raw totals"""
+    rng = chunk_rng(seed, chunk_index)
+    team1 = build_team(team1_snapshot)
+    team2 = build_team(team2_snapshot)
+    team1_wins = 0
+    scores = Counter()
+    totals = {team1.name: _empty_totals(team1), team2.name: _empty_totals(team2)}
+
+    for _ in range(count):
+        result = play_series(team1, team2, series_type, rng=rng)
+        if result.team1_wins > result.team2_wins:
+            team1_wins += 1
+        scores[(result.team1_wins, result.team2_wins)] += 1
+        for team in (team1, team2):
+            for row, p in zip(totals[team.name], team.players):
+                row[0] += p.kills
+                row[1] += p.deaths
+                row[2] += p.assists
+
+    return {"series": count, "team1_wins": team1_wins, "scores": scores, "totals": totals}
+
+
+def merge_chunks(team1, team2, chunks) -> Dict:
+    """Merge chunk totals (in chunk order) into a single report"""
+    series = sum(c["series"] for c in chunks)
+    team1_wins = sum(c["team1_wins"] for c in chunks)
+    scores = Counter()
+    totals = {team1.name: _empty_totals(team1), team2.name: _empty_totals(team2)}
+    for chunk in chunks:
+        scores.update(chunk["scores"])
+        for team_name, rows in chunk["totals"].items():
+            for merged, row in zip(totals[team_name], rows):
+                for i in range(3):
+                    merged[i] += row[i]
+
+    player_stats = {}
+    for team in (team1, team2):
+        player_stats[team.name] = [
+            {
+                "name": p.name,
+                "kills": kills / series if series else 0.0,
+                "deaths": deaths / series if series else 0.0,
+                "assists": assists / series if series else 0.0
+            }
+            for p, (kills, deaths, assists) in zip(team.players, totals[team.name])
+        ]
+
+    return {
+        "series": series,
+        "team1": team1.name,
+        "team2": team2.name,
+        "team1_wins": team1_wins,
+        "team1_win_rate": team1_wins / series if series else 0.0,
+        "score_histogram": dict(sorted(scores.items())),
+        "player_stats": player_stats
+    }
+
+
+def chunk_plan(n: int, start_chunk: int = 0) -> List[Tuple[int, int]]:
+    """(chunk_index, count) pairs covering n series"""
+    return [(start_chunk + i, min(CHUNK_SIZE, n - offset))
+            for i, offset in enumerate(range(0, n, CHUNK_SIZE))]
+
+
+def run_chunks(team1, team2, series_type: str, seed: int, plan, workers: Optional[int] = None,
+               executor=None) -> List[Dict]:
+    """Run the chunks in plan, in a process pool unless a single worker is requested"""
+    snapshots = (team_snapshot(team1), team_snapshot(team2))
+    args = [(snapshots[0], snapshots[1], series_type, seed, index, count) for index, count in plan]
+    if executor is not None:
+        return list(executor.map(run_chunk, *zip(*args))) if args else []
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(args) <= 1:
+        return [run_chunk(*a) for a in args]
+    with ProcessPoolExecutor(max_workers=min(workers, len(args))) as pool:
+        return list(pool.map(run_chunk, *zip(*args)))
+
+
+def run_series_simulations(team1, team2, series_type: str, n: int, seed: int = 0,
+                           workers: Optional[int] = None) -> Dict:
+    """Simulate n series between team1 and team2 across worker processes.
+
+    Returns a report with the team1 win rate, a histogram of series scores
+    keyed by (team1 maps, team2 maps), and mean K/D/A per player per series.
+    The report is identical for a given seed whatever the number of workers.
+    """
+    chunks = run_chunks(team1, team2, series_type, seed, chunk_plan(n), workers)
+    return merge_chunks(team1, team2, chunks)
+
+
+def wilson_interval(successes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion"""
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def estimate_series_odds(team1, team2, series_type: str, target_ci: float = 0.005,
+                         confidence: float = 0.95, seed: int = 0, workers: Optional[int] = 1,
+                         max_series: int = 1000000) -> Dict:
+    """Estimate P(team1 wins the series), simulating only until the estimate is precise enough.
+
+    Chunks of CHUNK_SIZE series are simulated in order, and the running Wilson
+    interval is checked after each one. Sampling stops once its half-width is
+    at most target_ci (or max_series is reached). Lopsided matchups therefore
+    need far fewer samples than even ones. The stopping point only depends on
+    the seed, not on the number of workers.
+    """
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    chunks = []
+    successes = trials = 0
+    low, high = 0.0, 1.0
+    next_chunk = 0
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while trials < max_series and (high - low) / 2 > target_ci:
+            # Run up to one chunk per worker at a time, but check the interval after each chunk
+            plan = chunk_plan(min(CHUNK_SIZE * workers, max_series - trials), next_chunk)
+            next_chunk += len(plan)
+            for chunk in run_chunks(team1, team2, series_type, seed, plan, workers, executor):
+                chunks.append(chunk)
+                successes += chunk["team1_wins"]
+                trials += chunk["series"]
+                low, high = wilson_interval(successes, trials, confidence)
+                if (high - low) / 2 <= target_ci:
+                    break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    report = merge_chunks(team1, team2, chunks)
+    report.update({
+        "ci_low": low,
+        "ci_high": high,
+        "half_width": (high - low) / 2,
+        "confidence": confidence,
+        "converged": (high - low) / 2 <= target_ci,
+        "samples": trials,
+        "wall_time": time.perf_counter() - start
+    })
+    return report
@@ -6,227 +6,534 @@ def load_teams_from_db(db_path="cs2_simulator.db"):
     for team_name, players in teams_dict.items():
         teams[team_name] = [Player(p["name"], p["rating"]) for p in players]
     return teams
+import hashlib
 import random
 import json
+from array import array
 
 ROUNDS_TO_WIN = 13
+MAX_ROUNDS = 40  # Prevent infinite loops
+MAX_OVERTIMES = 8
+OVERTIME_ROUNDS = 3  # MR3: each overtime pushes the target up by 3 rounds
+FORM_SPREAD = 5  # Daily form swings a player's rating by up to +/- this much
+SERIES_MAPS_TO_WIN = {"BO1": 1, "BO3": 2, "BO5": 3}
+# Bump whenever a change makes the same seed and lineups produce a different series
+ENGINE_VERSION = 1
+
+_ZEROS = {}  # Shared all-zero counter arrays, keyed by length
+_SLOTS = {}  # Shared (kill, death, assist) index ranges, keyed by roster size
+
+
+def _zeros(length):
+    zeros = _ZEROS.get(length)
+    if zeros is None:
+        zeros = _ZEROS[length] = array("l", bytes(array("l").itemsize * length))
+    return zeros
+
+
+def _slots(size):
+    slots = _SLOTS.get(size)
+    if slots is None:
+        slots = _SLOTS[size] = (range(0, size), range(size, 2 * size), range(2 * size, 3 * size))
+    return slots
+
+
+class AliasSampler:
+    """Walker's alias table over a fixed set of stat slots.
+
+    Built once from the weights, it draws each event with a single random()
+    call, so k events cost O(k) instead of rebuilding cumulative weights.
+    """
+    __slots__ = ("size", "prob", "keep_slots", "alias_slots")
+
+    def __init__(self, slots, weights=None):
+        size = len(slots)
+        if weights is None:
+            scaled = [1.0] * size
+        else:
+            total = sum(weights)
+            if total <= 0:
+                raise ValueError("Total of weights must be greater than zero")
+            scaled = [w * size / total for w in weights]
+        prob = [1.0] * size
+        alias = list(range(size))
+        small = [i for i, x in enumerate(scaled) if x < 1.0]
+        large = [i for i, x in enumerate(scaled) if x >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        self.size = size
+        self.prob = prob
+        self.keep_slots = list(slots)
+        self.alias_slots = [slots[i] for i in alias]
+
+    def add_events(self, counts, rng, k):
+        """Draw k slots and increment counts[slot] for each"""
+        draw = rng.random
+        size = self.size
+        prob = self.prob
+        keep_slots = self.keep_slots
+        alias_slots = self.alias_slots
+        for _ in range(k):
+            u = draw() * size
+            i = int(u)
+            counts[keep_slots[i] if u - i < prob[i] else alias_slots[i]] += 1
+
+
+class RosterState:
+    """Ratings and stat counters of a roster, stored column-wise in typed arrays.
+
+    `stats` holds the kills, deaths and assists columns back to back; the
+    *_slots ranges give the indices of each column, so the round loop can
+    increment counters directly. Player objects are only views onto one slot.
+    """
+    __slots__ = ("ratings", "stats", "hltv_ratings", "kill_slots", "death_slots", "assist_slots",
+                 "_samplers")
+
+    def __init__(self, ratings, kills=None, deaths=None, assists=None):
+        size = len(ratings)
+        self.ratings = array("d", ratings)
+        if kills is None:
+            self.stats = array("l", _zeros(3 * size))
+        else:
+            self.stats = array("l", kills)
+            self.stats.extend(deaths)
+            self.stats.extend(assists)
+        self.hltv_ratings = None
+        self.kill_slots, self.death_slots, self.assist_slots = _slots(size)
+        self._samplers = None
+
+    def __len__(self):
+        return len(self.ratings)
+
+    def reset_stats(self):
+        """Zero the kill, death and assist counters"""
+        self.stats[:] = _zeros(len(self.stats))
+
+    def samplers(self):
+        """(kill, death, assist) AliasSamplers, built on first use and cached until ratings change"""
+        if self._samplers is None:
+            self._samplers = (AliasSampler(self.kill_slots, self.ratings),
+                              AliasSampler(self.death_slots),
+                              AliasSampler(self.assist_slots, self.ratings))
+        return self._samplers
+
+    def invalidate_samplers(self):
+        """Drop cached samplers; call after changing `ratings` directly"""
+        self._samplers = None
+
+    def set_hltv_rating(self, index, value):
+        if self.hltv_ratings is None:
+            self.hltv_ratings = array("d", bytes(array("d").itemsize * len(self.ratings)))
+        self.hltv_ratings[index] = value
+
 
 class Player:
+    """A player; rating and stats live in the RosterState of the player's team"""
+    __slots__ = ("name", "_state", "_index")
+
     def __init__(self, name, rating):
         self.name = name
-        self.rating = rating
-        self.kills = 0
-        self.assists = 0
-        self.deaths = 0
-
-    def get_impact(self):
+        self._state = RosterState([rating])
+        self._index = 0
+
+    @classmethod
+    def view(cls, name, state, index):
+        """Player bound to slot `index` of an existing roster state"""
+        player = cls.__new__(cls)
+        player.name = name
+        player._state = state
+        player._index = index
+        return player
+
+    @property
+    def rating(self):
+        return self._state.ratings[self._index]
+
+    @rating.setter
+    def rating(self, value):
+        self._state.ratings[self._index] = value
+        self._state.invalidate_samplers()
+
+    @property
+    def kills(self):
+        return self._state.stats[self._index]
+
+    @kills.setter
+    def kills(self, value):
+        self._state.stats[self._index] = value
+
+    @property
+    def deaths(self):
+        return self._state.stats[len(self._state) + self._index]
+
+    @deaths.setter
+    def deaths(self, value):
+        self._state.stats[len(self._state) + self._index] = value
+
+    @property
+    def assists(self):
+        return self._state.stats[2 * len(self._state) + self._index]
+
+    @assists.setter
+    def assists(self, value):
+        self._state.stats[2 * len(self._state) + self._index] = value
+
+    @property
+    def hltv_rating(self):
+        hltv_ratings = self._state.hltv_ratings
+        if hltv_ratings is None:
+            raise AttributeError("hltv_rating is only set once a series has been played")
+        return hltv_ratings[self._index]
+
+    @hltv_rating.setter
+    def hltv_rating(self, value):
+        self._state.set_hltv_rating(self._index, value)
+
+    def get_impact(self, rng=random):
         # forme du jour : -5 à +5
-        return self.rating + random.uniform(-5, 5)
+        return self.rating + rng.uniform(-FORM_SPREAD, FORM_SPREAD)
 
 
 class Team:
+    """A named roster. Player objects are created lazily as views onto the team's RosterState."""
+    __slots__ = ("name", "names", "state", "_players")
+
     def __init__(self, name, players):
         self.name = name
         self.players = players
 
-    def get_power(self):
-        impacts = [p.get_impact() for p in self.players]
+    @classmethod
+    def from_roster(cls, name, roster):
+        """Build a team from (player name, rating) pairs without creating Player objects"""
+        team = cls.__new__(cls)
+        team.name = name
+        team.names = tuple(player_name for player_name, _ in roster)
+        team.state = RosterState([rating for _, rating in roster])
+        team._players = None
+        return team
+
+    @property
+    def players(self):
+        if self._players is None:
+            self._players = [Player.view(player_name, self.state, index)
+                             for index, player_name in enumerate(self.names)]
+        return self._players
+
+    @players.setter
+    def players(self, players):
+        """Set the roster and move the players' ratings and stats into one shared RosterState"""
+        players = list(players)
+        state = RosterState([p.rating for p in players],
+                            [p.kills for p in players],
+                            [p.deaths for p in players],
+                            [p.assists for p in players])
+        for index, p in enumerate(players):
+            p._state = state
+            p._index = index
+        self.names = tuple(p.name for p in players)
+        self.state = state
+        self._players = players
+
+    def reset_stats(self):
+        self.state.reset_stats()
+
+    def get_power(self, rng=random):
+        uniform = rng.uniform
+        impacts = [rating + uniform(-FORM_SPREAD, FORM_SPREAD) for rating in self.state.ratings]
         return sum(impacts) / len(impacts)
 
 
-def simulate_round(team1, team2):
-    p1 = team1.get_power()
-    p2 = team2.get_power()
+def simulate_round(team1, team2, rng=random):
+    p1 = team1.get_power(rng)
+    p2 = team2.get_power(rng)
     prob_t1_win = (p1 ** 3) / (p1 ** 3 + p2 ** 3) if p1 + p2 > 0 else 0.5
-    winner = team1 if random.random() < prob_t1_win else team2
-    loser = team2 if winner == team1 else team1
-
-    # Simulate kills for winner
-    win_kills = random.randint(4, 6)
-    weights = [p.rating for p in winner.players]
-    kill_players = random.choices(winner.players, weights=weights, k=win_kills)
-    for p in kill_players:
-        p.kills += 1
-
-    # Deaths for loser
-    death_players = random.choices(loser.players, k=win_kills)
-    for p in death_players:
-        p.deaths += 1
-
-    # Assists for winner
-    assist_count = random.randint(0, win_kills // 2)
-    assist_players = random.choices(winner.players, weights=weights, k=assist_count)
-    for p in assist_players:
-        p.assists += 1
-
-    return winner == team1  # True if team1 wins the round
-
-
-def simulate_series(team1, team2, series_type):
-    if series_type == "BO1":
-        maps_to_win = 1
-    elif series_type == "BO3":
-        maps_to_win = 2
-    elif series_type == "BO5":
-        maps_to_win = 3
-    else:
+    team1_wins_round = rng.random() < prob_t1_win
+    winner = team1.state if team1_wins_round else team2.state
+    loser = team2.state if team1_wins_round else team1.state
+
+    # Simulate kills for winner (weighted by rating)
+    kill_sampler, _, assist_sampler = winner.samplers()
+    win_kills = rng.randint(4, 6)
+    kill_sampler.add_events(winner.stats, rng, win_kills)
+
+    # Deaths for loser (uniform)
+    loser.samplers()[1].add_events(loser.stats, rng, win_kills)
+
+    # Assists for winner (weighted by rating)
+    assist_count = rng.randint(0, win_kills // 2)
+    assist_sampler.add_events(winner.stats, rng, assist_count)
+
+    return team1_wins_round  # True if team1 wins the round
+
+
+def next_overtime(score1, score2, target):
+    """Return (target, margin, overtime_level) if the score starts a new overtime, else None"""
+    level = (target - ROUNDS_TO_WIN) // OVERTIME_ROUNDS + 1
+    if level <= MAX_OVERTIMES and score1 >= target - 1 and score2 >= target - 1:
+        return target + OVERTIME_ROUNDS, level + 1, level
+    return None
+
+
+class MapResult:
+    """Result of one map. Rounds are kept as a compact winner array (1 = team1 won the round)."""
+    def __init__(self, team1_name, team2_name, round_winners, team1_won, overtime_level):
+        self.team1_name = team1_name
+        self.team2_name = team2_name
+        self.round_winners = round_winners
+        self.team1_won = team1_won
+        self.overtime_level = overtime_level
+        self.score1 = sum(round_winners)
+        self.score2 = len(round_winners) - self.score1
+
+    @property
+    def winner(self):
+        return self.team1_name if self.team1_won else self.team2_name
+
+    @property
+    def loser(self):
+        return self.team2_name if self.team1_won else self.team1_name
+
+    @property
+    def w_score(self):
+        return self.score1 if self.team1_won else self.score2
+
+    @property
+    def l_score(self):
+        return self.score2 if self.team1_won else self.score1
+
+    def round_lines(self):
+        """Round-by-round text ("Round N: X wins"), built only when asked for"""
+        names = (self.team2_name, self.team1_name)
+        return [f"Round {i}: {names[w]} wins" for i, w in enumerate(self.round_winners, 1)]
+
+    def summary(self, map_num):
+        return f"Map {map_num}: {self.winner} {self.w_score} - {self.l_score} {self.loser}"
+
+    def log_lines(self, map_num):
+        """Lines simulate_series prints for this map"""
+        lines = ["", f"--- Map {map_num} ---",
+                 f"Map {map_num} Result: {self.winner} {self.w_score} - {self.l_score} {self.loser}"]
+        if self.overtime_level > 0:
+            lines.append(f"(After {self.overtime_level} overtime{'s' if self.overtime_level > 1 else ''})")
+        return lines
+
+
+class SeriesResult:
+    """Result of a series; text output is rendered on demand"""
+    def __init__(self, team1_name, team2_name, series_type, maps, player_rows):
+        self.team1_name = team1_name
+        self.team2_name = team2_name
+        self.series_type = series_type
+        self.maps = maps
+        # team name -> [(name, kills, deaths, assists, hltv_rating), ...]
+        self.player_rows = player_rows
+        self.team1_wins = sum(1 for m in maps if m.team1_won)
+        self.team2_wins = len(maps) - self.team1_wins
+        # Set by play_series when run from an explicit seed; with them the series can be replayed
+        self.seed = None
+        self.lineups = None
+
+    @property
+    def winner(self):
+        return self.team1_name if self.team1_wins > self.team2_wins else self.team2_name
+
+    @property
+    def loser(self):
+        return self.team2_name if self.team1_wins > self.team2_wins else self.team1_name
+
+    @property
+    def overtime_levels(self):
+        return [m.overtime_level for m in self.maps]
+
+    @property
+    def total_rounds(self):
+        return sum(len(m.round_winners) for m in self.maps)
+
+    @property
+    def map_results(self):
+        return [m.summary(i) for i, m in enumerate(self.maps, 1)]
+
+    @property
+    def all_rounds(self):
+        return [line for m in self.maps for line in m.round_lines()]
+
+    @property
+    def player_stats(self):
+        """Per-team player stat dicts (same shape as simulate_series' match_player_stats)"""
+        return {
+            team_name: [
+                {"name": name, "kills": kills, "deaths": deaths, "assists": assists,
+                 "hltv_rating": hltv_rating}
+                for name, kills, deaths, assists, hltv_rating in rows
+            ]
+            for team_name, rows in self.player_rows.items()
+        }
+
+    def log_lines(self):
+        """Lines simulate_series prints while the series is played"""
+        return [line for i, m in enumerate(self.maps, 1) for line in m.log_lines(i)]
+
+    def render(self):
+        """Full text report, exactly as the quick match screen shows it"""
+        lines = self.log_lines()
+        lines += ["", "=== SERIES RESULTS ===",
+                  f"{self.winner} wins the {self.series_type} series {self.team1_wins} - {self.team2_wins}",
+                  "", "Map results:"]
+        lines += self.map_results
+        for team_name, rows in self.player_rows.items():
+            lines += ["", f"{team_name} Player Stats:"]
+            lines += [f"  {name}: {kills}K / {assists}A / {deaths}D - Rating: {hltv_rating:.2f}"
+                      for name, kills, deaths, assists, hltv_rating in rows]
+        return "\n".join(lines) + "\n"
+
+    def as_tuple(self):
+        """Legacy simulate_series return value"""
+        match_player_stats = {
+            team_name: [{"name": name, "kills": kills, "deaths": deaths, "assists": assists}
+                        for name, kills, deaths, assists, _ in rows]
+            for team_name, rows in self.player_rows.items()
+        }
+        return (self.winner, self.loser, self.team1_wins, self.team2_wins, self.map_results,
+                self.all_rounds, self.overtime_levels, match_player_stats)
+
+
+def hltv_rating(kills, deaths, total_rounds):
+    """HLTV-style rating for a series from K/D and the number of rounds played"""
+    if total_rounds <= 0:
+        return 1.0
+    if kills == 0:
+        return 0.3
+    return max(0.5, 1.5 * (kills - deaths) / total_rounds + 1.0)
+
+
+def new_seed():
+    """Fresh seed for a replayable series (fits a signed 64-bit SQLite INTEGER)"""
+    return random.SystemRandom().getrandbits(63)
+
+
+def match_lineups(team1, team2):
+    """Canonical JSON of both lineups in play order; with a seed it fully determines a series"""
+    return json.dumps([[team.name, [[p.name, p.rating] for p in team.players]] for team in (team1, team2)])
+
+
+def lineups_hash(lineups):
+    return hashlib.sha1(lineups.encode("utf-8")).hexdigest()
+
+
+def play_series(team1, team2, series_type, rng=random, verbose=False, seed=None):
+    """Play a series and return a SeriesResult. Prints the map log only when verbose.
+
+    With a seed the series uses its own random.Random(seed) instead of rng,
+    and the result records the seed and lineups needed to replay it exactly.
+    """
+    if series_type not in SERIES_MAPS_TO_WIN:
         raise ValueError("Invalid series type")
+    maps_to_win = SERIES_MAPS_TO_WIN[series_type]
+    if seed is not None:
+        rng = random.Random(seed)
+        lineups = match_lineups(team1, team2)
 
     # Reset stats for the series
-    for team in [team1, team2]:
-        for p in team.players:
-            p.kills = 0
-            p.assists = 0
-            p.deaths = 0
+    team1.reset_stats()
+    team2.reset_stats()
 
     team1_wins = 0
     team2_wins = 0
-    map_results = []
-    all_rounds = []
-    overtime_levels = []
-
-    match_player_stats = {
-        team1.name: [],
-        team2.name: []
-    }
+    maps = []
     while team1_wins < maps_to_win and team2_wins < maps_to_win:
-        map_num = team1_wins + team2_wins + 1
-        print(f"\n--- Map {map_num} ---")
-        
-        winner, loser, w_score, l_score, rounds, overtime_level = simulate_match(team1, team2, reset_stats=False)
-        
-        if winner == team1.name:
+        result = play_match(team1, team2, reset_stats=False, rng=rng)
+        if result.team1_won:
             team1_wins += 1
         else:
             team2_wins += 1
-        
-        map_results.append(f"Map {map_num}: {winner} {w_score} - {l_score} {loser}")
-        all_rounds.extend(rounds)
-        overtime_levels.append(overtime_level)
-        
-        print(f"Map {map_num} Result: {winner} {w_score} - {l_score} {loser}")
-        if overtime_level > 0:
-            print(f"(After {overtime_level} overtime{'s' if overtime_level > 1 else ''})")
-            # Collect player stats for both teams after the series
-            for p in team1.players:
-                match_player_stats[team1.name].append({
-                    "name": p.name,
-                    "kills": p.kills,
-                    "deaths": p.deaths,
-                    "assists": p.assists
-                })
-            for p in team2.players:
-                match_player_stats[team2.name].append({
-                    "name": p.name,
-                    "kills": p.kills,
-                    "deaths": p.deaths,
-                    "assists": p.assists
-                })
-
-    series_winner = team1 if team1_wins == maps_to_win else team2
-    series_loser = team2 if series_winner == team1 else team1
-    
+        maps.append(result)
+        if verbose:
+            print("\n".join(result.log_lines(len(maps))))
+
     # Calculate HLTV-style ratings for the entire series
-    total_rounds = len(all_rounds)
+    total_rounds = sum(len(m.round_winners) for m in maps)
+    player_rows = {}
     for team in [team1, team2]:
+        rows = []
         for p in team.players:
-            if total_rounds > 0:
-                if p.kills == 0:
-                    p.hltv_rating = 0.3
-                else:
-                    p.hltv_rating = max(0.5, 1.5 * (p.kills - p.deaths) / total_rounds + 1.0)
-            else:
-                p.hltv_rating = 1.0
-            return series_winner.name, series_loser.name, team1_wins, team2_wins, map_results, all_rounds, overtime_levels, match_player_stats
-    return series_winner.name, series_loser.name, team1_wins, team2_wins, map_results, all_rounds, overtime_levels
+            p.hltv_rating = hltv_rating(p.kills, p.deaths, total_rounds)
+            rows.append((p.name, p.kills, p.deaths, p.assists, p.hltv_rating))
+        player_rows[team.name] = rows
 
+    result = SeriesResult(team1.name, team2.name, series_type, maps, player_rows)
+    if seed is not None:
+        result.seed = seed
+        result.lineups = lineups
+    return result
 
-def simulate_match(team1, team2, reset_stats=True):
+
+def simulate_series(team1, team2, series_type, rng=random, verbose=True):
+    """Play a series and return the legacy result tuple
+    (winner, loser, team1_wins, team2_wins, map_results, all_rounds, overtime_levels, match_player_stats)"""
+    return play_series(team1, team2, series_type, rng=rng, verbose=verbose).as_tuple()
+
+
+def play_match(team1, team2, reset_stats=True, rng=random):
+    """Play one map and return a MapResult"""
     if reset_stats:
         # Reset stats
-        for team in [team1, team2]:
-            for p in team.players:
-                p.kills = 0
-                p.assists = 0
-                p.deaths = 0
+        team1.reset_stats()
+        team2.reset_stats()
 
     score1 = 0
     score2 = 0
-    rounds = []
-    target = 13
+    round_winners = bytearray()
+    target = ROUNDS_TO_WIN
     margin = 1
     overtime_level = 0
-    max_rounds = 40  # Prevent infinite loops
+    max_rounds = MAX_ROUNDS
 
     while True:
-        team1_wins_round = simulate_round(team1, team2)
+        team1_wins_round = simulate_round(team1, team2, rng)
         if team1_wins_round:
             score1 += 1
         else:
             score2 += 1
+        round_winners.append(team1_wins_round)
 
         round_num = score1 + score2
-        rounds.append(f"Round {round_num}: {team1.name if team1_wins_round else team2.name} wins")
 
         # Check for max rounds
         if round_num >= max_rounds:
             if score1 > score2:
-                winner = team1
+                team1_won = True
             elif score2 > score1:
-                winner = team2
+                team1_won = False
             else:
                 # Tie, random winner
-                winner = team1 if random.random() < 0.5 else team2
+                team1_won = rng.random() < 0.5
             break
 
         # Check if match ends
         if score1 >= target and (score1 - score2) >= margin:
-            winner = team1
+            team1_won = True
             break
         if score2 >= target and (score2 - score1) >= margin:
-            winner = team2
+            team1_won = False
             break
 
         # Check for overtime
-        if score1 >= 12 and score2 >= 12 and target == 13:
-            target = 16
-            margin = 2
-            overtime_level = 1
-        elif score1 >= 15 and score2 >= 15 and target == 16:
-            target = 19
-            margin = 3
-            overtime_level = 2
-        elif score1 >= 18 and score2 >= 18 and target == 19:
-            target = 22
-            margin = 4
-            overtime_level = 3
-        elif score1 >= 21 and score2 >= 21 and target == 22:
-            target = 25
-            margin = 5
-            overtime_level = 4
-        elif score1 >= 24 and score2 >= 24 and target == 25:
-            target = 28
-            margin = 6
-            overtime_level = 5
-        elif score1 >= 27 and score2 >= 27 and target == 28:
-            target = 31
-            margin = 7
-            overtime_level = 6
-        elif score1 >= 30 and score2 >= 30 and target == 31:
-            target = 34
-            margin = 8
-            overtime_level = 7
-        elif score1 >= 33 and score2 >= 33 and target == 34:
-            target = 37
-            margin = 9
-            overtime_level = 8
-
-    loser = team2 if winner == team1 else team1
-    w_score = score1 if winner == team1 else score2
-    l_score = score2 if winner == team1 else score1
-    total_rounds = score1 + score2
-
-    return winner.name, loser.name, w_score, l_score, rounds, overtime_level
+        overtime = next_overtime(score1, score2, target)
+        if overtime:
+            target, margin, overtime_level = overtime
+
+    return MapResult(team1.name, team2.name, round_winners, team1_won, overtime_level)
+
+
+def simulate_match(team1, team2, reset_stats=True, rng=random):
+    """Play one map and return (winner, loser, w_score, l_score, rounds, overtime_level)"""
+    result = play_match(team1, team2, reset_stats=reset_stats, rng=rng)
+    return result.winner, result.loser, result.w_score, result.l_score, result.round_lines(), result.overtime_level
 
 
 def print_player_stats(team):
@@ -0,0 +1,517 @@
+"""
+Tournament stage simulators built on the series engine.
+
+The Swiss stage follows the Major format: teams advance at three wins and
+are eliminated at three losses, and each round pairs teams with the same
+record using Buchholz seeding. A stage can be played out with play_series
+for every match, or on a fast path that samples each series from cached
+pairwise win probabilities. Runs are split into seeded chunks like
+cs2_montecarlo, so results depend only on the seed and the number of runs.
+
+Playoff brackets (single elimination, GSL groups and double elimination)
+are described as an ordered list of matches. Title odds are computed exactly,
+by propagating pairwise series odds through a single-elimination bracket or
+by a dynamic program over the teams in still-undecided slots for other
+formats (up to 16-team double elimination), and any bracket can also be
+sampled for path-dependent outputs such as the likely finals.
+"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from cs2_analytic import rating_odds
+from cs2_montecarlo import team_snapshot, build_team, chunk_rng
+from cs2_simulator import play_series
+
+SWISS_WINS = 3    # Wins needed to advance from the Swiss stage
+SWISS_LOSSES = 3  # Losses that eliminate a team
+CHUNK_SIZE = 1000  # Stage runs per task
+MAX_EXACT_STATES = 200000  # Distinct live-slot assignments exact_placements will track
+
+
+class PairwiseOdds:
+    """Memoized series win probabilities between named teams"""
+    def __init__(self, profiles: Dict[str, Tuple[float, int]]):
+        # Team name -> (average rating, player count), all the model depends on
+        self.profiles = profiles
+        self._cache = {}
+
+    @classmethod
+    def from_teams(cls, teams) -> "PairwiseOdds":
+        return cls({team.name: (sum(p.rating for p in team.players) / len(team.players), len(team.players))
+                    for team in teams})
+
+    @classmethod
+    def from_teams_dict(cls, teams_dict: Dict) -> "PairwiseOdds":
+        """Build from a teams.json / CS2Database.get_teams_dict style mapping"""
+        return cls({name: (sum(p["rating"] for p in players) / len(players), len(players))
+                    for name, players in teams_dict.items() if players})
+
+    def probability(self, team1: str, team2: str, series_type: str = "map") -> float:
+        """P(team1 beats team2) for "map", "BO1", "BO3" or "BO5" """
+        key = (team1, team2)
+        odds = self._cache.get(key)
+        if odds is None:
+            rating1, players1 = self.profiles[team1]
+            rating2, players2 = self.profiles[team2]
+            odds = self._cache[key] = rating_odds(rating1, rating2, players1, players2)
+            # Every series has exactly one winner, so the reverse pair comes for free
+            self._cache[(team2, team1)] = {k: 1 - value for k, value in odds.items()}
+        return odds[series_type]
+
+
+def swiss_series_type(wins1: int, losses1: int, wins2: int, losses2: int) -> str:
+    """BO3 when the match can decide advancement or elimination, otherwise BO1"""
+    if SWISS_WINS - 1 in (wins1, wins2) or SWISS_LOSSES - 1 in (losses1, losses2):
+        return "BO3"
+    return "BO1"
+
+
+def _pair_group(group: List[int], met: List[int]) -> Optional[List[Tuple[int, int]]]:
+    """Pair the top remaining team with the lowest one it has not played yet"""
+    if not group:
+        return []
+    top = group[0]
+    for k in range(len(group) - 1, 0, -1):
+        other = group[k]
+        if not met[top] >> other & 1:
+            rest = _pair_group(group[1:k] + group[k + 1:], met)
+            if rest is not None:
+                return [(top, other)] + rest
+    return None
+
+
+def swiss_pairings(active: List[int], wins: List[int], losses: List[int],
+                   opponents: List[List[int]], met: List[int]) -> List[Tuple[int, int]]:
+    """Pair the active teams for the next Swiss round.
+
+    Teams are grouped by record and ordered by Buchholz score (the sum of
+    their opponents' win-loss differences), then by initial seed. Within a
+    group the highest team meets the lowest one it has not already played.
+    An odd team out drops into the next group.
+    """
+    groups = {}
+    for team in active:
+        record = (wins[team], losses[team])
+        if record in groups:
+            groups[record].append(team)
+        else:
+            groups[record] = [team]
+
+    balance = [w - l for w, l in zip(wins, losses)]
+    pairs = []
+    carry = []
+    for record in sorted(groups, key=lambda r: (r[1] - r[0], r[1])):
+        group = groups[record]
+        if len(group) > 1:
+            group.sort(key=lambda t: (-sum(balance[o] for o in opponents[t]), t))
+        group = carry + group
+        carry = group[-1:] if len(group) % 2 else []
+        if carry:
+            group = group[:-1]
+        paired = _pair_group(group, met)
+        if paired is None:
+            # Rematches are unavoidable, fall back to plain high-versus-low
+            half = len(group) // 2
+            paired = list(zip(group[:half], reversed(group[half:])))
+        pairs.extend(paired)
+    return pairs
+
+
+def play_swiss_stage(size: int, decide) -> Tuple[List[int], List[int]]:
+    """Play one Swiss stage between teams 0..size-1 (in seed order).
+
+    decide(team1, team2, series_type) returns True when team1 wins.
+    Returns the final (wins, losses) lists.
+    """
+    wins = [0] * size
+    losses = [0] * size
+    opponents = [[] for _ in range(size)]
+    met = [0] * size
+    half = size // 2
+    # The opening round pairs the top half against the bottom half by seed
+    pairs = [(i, i + half) for i in range(half)]
+    while pairs:
+        for team1, team2 in pairs:
+            series_type = swiss_series_type(wins[team1], losses[team1], wins[team2], losses[team2])
+            if decide(team1, team2, series_type):
+                wins[team1] += 1
+                losses[team2] += 1
+            else:
+                wins[team2] += 1
+                losses[team1] += 1
+            opponents[team1].append(team2)
+            opponents[team2].append(team1)
+            met[team1] |= 1 << team2
+            met[team2] |= 1 << team1
+        active = [t for t in range(size) if wins[t] < SWISS_WINS and losses[t] < SWISS_LOSSES]
+        pairs = swiss_pairings(active, wins, losses, opponents, met)
+    return wins, losses
+
+
+def _odds_table(names: List[str], odds, series_types=("BO1", "BO3")) -> Dict[str, List[List[float]]]:
+    return {series_type: [[odds.probability(a, b, series_type) if a != b else 0.5 for b in names]
+                          for a in names]
+            for series_type in series_types}
+
+
+def _chunks(run, args_for, n: int, workers: Optional[int]) -> List:
+    plan = [(i, min(CHUNK_SIZE, n - offset)) for i, offset in enumerate(range(0, n, CHUNK_SIZE))]
+    args = [args_for(index, count) for index, count in plan]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(args) <= 1:
+        return [run(*a) for a in args]
+    with ProcessPoolExecutor(max_workers=min(workers, len(args))) as pool:
+        return list(pool.map(run, *zip(*args)))
+
+
+def run_swiss_chunk(snapshots, table, seed: int, chunk_index: int, count: int) -> Dict[str, List[int]]:
+    """Simulate one chunk of Swiss stages and count advancements and 3-0 / 0-3 records"""
+    rng = chunk_rng(seed, chunk_index)
+    size = len(snapshots)
+    if table is not None:
+        draw = rng.random
+
+        def decide(team1, team2, series_type):
+            return draw() < table[series_type][team1][team2]
+    else:
+        teams = [build_team(s) for s in snapshots]
+
+        def decide(team1, team2, series_type):
+            result = play_series(teams[team1], teams[team2], series_type, rng=rng)
+            return result.team1_wins > result.team2_wins
+
+    counts = {"advance": [0] * size, "3-0": [0] * size, "0-3": [0] * size}
+    for _ in range(count):
+        wins, losses = play_swiss_stage(size, decide)
+        for team in range(size):
+            if wins[team] == SWISS_WINS:
+                counts["advance"][team] += 1
+                if losses[team] == 0:
+                    counts["3-0"][team] += 1
+            elif wins[team] == 0:
+                counts["0-3"][team] += 1
+    return counts
+
+
+def simulate_swiss_stage(teams, n: int = 10000, seed: int = 0, workers: Optional[int] = None,
+                         odds=None, fast: bool = True) -> Dict[str, Dict[str, float]]:
+    """Run a Swiss stage n times and return each team's outcome probabilities.
+
+    teams are Team objects in seed order. On the fast path every series is a
+    single draw against pairwise probabilities from odds (a PairwiseOdds or
+    MatchupMatrix, built from the rosters when omitted); with fast=False
+    every series is played out with play_series. The result maps team name
+    to {"advance", "3-0", "0-3"} probabilities.
+    """
+    names = [team.name for team in teams]
+    snapshots = [team_snapshot(team) for team in teams]
+    table = None
+    if fast:
+        table = _odds_table(names, odds or PairwiseOdds.from_teams(teams))
+
+    chunks = _chunks(run_swiss_chunk, lambda index, count: (snapshots, table, seed, index, count), n, workers)
+
+    report = {}
+    for index, name in enumerate(names):
+        report[name] = {key: sum(c[key][index] for c in chunks) / n if n else 0.0
+                        for key in ("advance", "3-0", "0-3")}
+    return report
+
+
+def _format(formats, index: int) -> str:
+    """Series type for a bracket round; the last format repeats for later rounds"""
+    if isinstance(formats, str):
+        return formats
+    return formats[min(index, len(formats) - 1)]
+
+
+def bracket_order(size: int) -> List[int]:
+    """Standard seeding positions, e.g. [0, 7, 3, 4, 1, 6, 2, 5] for 8 teams (1v8, 4v5, 2v7, 3v6)"""
+    if size & (size - 1):
+        raise ValueError("Bracket size must be a power of two")
+    order = [0]
+    while len(order) < size:
+        order = [seed for s in order for seed in (s, 2 * len(order) - 1 - s)]
+    return order
+
+
+class Bracket:
+    """A playoff bracket as an ordered list of matches.
+
+    Each match is (slot1, slot2, series_type). A slot is an index into teams,
+    or ("W", m) / ("L", m) for the winner or loser of earlier match m.
+    places maps finishing labels (e.g. "champion") to slots.
+    """
+    def __init__(self, teams: List[str], matches: List[Tuple], places: Dict[str, Tuple[str, int]],
+                 single_elimination: bool = False):
+        self.teams = list(teams)
+        self.matches = matches
+        self.places = places
+        self.single_elimination = single_elimination
+
+    def series_types(self) -> Tuple[str, ...]:
+        return tuple(sorted({series_type for _, _, series_type in self.matches}))
+
+    def play(self, decide) -> Tuple[List[int], List[int]]:
+        """Play every match; decide(team1, team2, series_type) returns True when team1 wins"""
+        winners = [0] * len(self.matches)
+        losers = [0] * len(self.matches)
+        for m, (slot1, slot2, series_type) in enumerate(self.matches):
+            team1 = _resolve(slot1, winners, losers)
+            team2 = _resolve(slot2, winners, losers)
+            if decide(team1, team2, series_type):
+                winners[m], losers[m] = team1, team2
+            else:
+                winners[m], losers[m] = team2, team1
+        return winners, losers
+
+
+def _resolve(slot, winners: List[int], losers: List[int]) -> int:
+    if isinstance(slot, int):
+        return slot
+    kind, match = slot
+    return winners[match] if kind == "W" else losers[match]
+
+
+def single_elimination(teams: List[str], formats="BO3") -> Bracket:
+    """Knockout bracket; teams are in bracket order, so teams 0 and 1 meet in round one.
+
+    formats is one series type for every round or a list per round.
+    """
+    if len(teams) < 2 or len(teams) & (len(teams) - 1):
+        raise ValueError("Bracket size must be a power of two")
+    matches = []
+    slots = list(range(len(teams)))
+    round_index = 0
+    while len(slots) > 1:
+        series_type = _format(formats, round_index)
+        next_slots = []
+        for slot1, slot2 in zip(slots[::2], slots[1::2]):
+            matches.append((slot1, slot2, series_type))
+            next_slots.append(("W", len(matches) - 1))
+        slots = next_slots
+        round_index += 1
+    final = len(matches) - 1
+    return Bracket(teams, matches, {"champion": ("W", final), "runner-up": ("L", final)},
+                   single_elimination=True)
+
+
+def gsl_group(teams: List[str], formats="BO3") -> Bracket:
+    """Four-team GSL group: opening matches 1v4 and 2v3, winners' and elimination matches, decider.
+
+    The winners' match winner finishes first, the decider winner second.
+    formats is one series type or a list for (opening, winners/elimination, decider).
+    """
+    if len(teams) != 4:
+        raise ValueError("A GSL group has four teams")
+    opening, second_round, decider = (_format(formats, i) for i in range(3))
+    matches = [
+        (0, 3, opening),
+        (1, 2, opening),
+        (("W", 0), ("W", 1), second_round),  # Winners' match
+        (("L", 0), ("L", 1), second_round),  # Elimination match
+        (("L", 2), ("W", 3), decider)
+    ]
+    return Bracket(teams, matches, {"first": ("W", 2), "second": ("W", 4)})
+
+
+def double_elimination(teams: List[str], formats="BO3") -> Bracket:
+    """Double-elimination bracket with a single grand final (no bracket reset).
+
+    teams are in bracket order. formats is one series type or a list with one
+    entry per upper-bracket round followed by the grand final; lower-bracket
+    matches use the format of the upper round they are played alongside.
+    """
+    if len(teams) < 4 or len(teams) & (len(teams) - 1):
+        raise ValueError("Bracket size must be a power of two")
+    matches = []
+
+    def play_round(pairs, series_type):
+        first = len(matches)
+        for slot1, slot2 in pairs:
+            matches.append((slot1, slot2, series_type))
+        return ([("W", m) for m in range(first, len(matches))],
+                [("L", m) for m in range(first, len(matches))])
+
+    upper, dropped = play_round(zip(range(0, len(teams), 2), range(1, len(teams), 2)), _format(formats, 0))
+    lower, _ = play_round(zip(dropped[::2], dropped[1::2]), _format(formats, 0))
+    round_index = 1
+    while len(upper) > 1:
+        series_type = _format(formats, round_index)
+        upper, dropped = play_round(zip(upper[::2], upper[1::2]), series_type)
+        # Dropped teams meet the lower bracket in reverse order to delay rematches
+        lower, _ = play_round(zip(lower, reversed(dropped)), series_type)
+        if len(lower) > 1:
+            lower, _ = play_round(zip(lower[::2], lower[1::2]), series_type)
+        round_index += 1
+    matches.append((upper[0], lower[0], _format(formats, round_index)))
+    final = len(matches) - 1
+    return Bracket(teams, matches, {"champion": ("W", final), "runner-up": ("L", final)})
+
+
+def _propagate(bracket: Bracket, odds) -> Dict[str, Dict[str, float]]:
+    """Exact single-elimination odds by pushing each slot's winner distribution up the bracket"""
+    # Each entry maps team index -> probability of occupying that slot
+    distributions = {}
+    for m, (slot1, slot2, series_type) in enumerate(bracket.matches):
+        sides = [{slot: 1.0} if isinstance(slot, int) else distributions[slot[1]] for slot in (slot1, slot2)]
+        winner = {}
+        for side, other in (sides, sides[::-1]):
+            for team, reach in side.items():
+                name = bracket.teams[team]
+                beat = sum(p * odds.probability(name, bracket.teams[opponent], series_type)
+                           for opponent, p in other.items())
+                winner[team] = reach * beat
+        distributions[m] = winner
+    final = len(bracket.matches) - 1
+    slot1, slot2, _ = bracket.matches[final]
+    finalists = {}
+    for slot in (slot1, slot2):
+        finalists.update({slot: 1.0} if isinstance(slot, int) else distributions[slot[1]])
+    return {
+        name: {"champion": distributions[final].get(i, 0.0),
+               "runner-up": finalists.get(i, 0.0) - distributions[final].get(i, 0.0)}
+        for i, name in enumerate(bracket.teams)
+    }
+
+
+def _state_order(bracket: Bracket) -> List[int]:
+    """Match order for exact_placements: greedily play the ready match that leaves the fewest slots pending.
+
+    Match outcomes are independent, so any order that plays a match after
+    the ones feeding it gives the same odds, but finishing one part of a
+    double-elimination bracket before opening the next keeps far fewer
+    states (about 100k instead of 300k at 16 teams).
+    """
+    users = {}
+    for m, (slot1, slot2, _) in enumerate(bracket.matches):
+        for slot in (slot1, slot2):
+            if not isinstance(slot, int):
+                users.setdefault(slot, set()).add(m)
+    for slot in bracket.places.values():
+        if not isinstance(slot, int):
+            users.setdefault(slot, set()).add(len(bracket.matches))
+
+    played, order, pending = set(), [], set()
+    while len(order) < len(bracket.matches):
+        best = None
+        for m, (slot1, slot2, _) in enumerate(bracket.matches):
+            inputs = [slot for slot in (slot1, slot2) if not isinstance(slot, int)]
+            if m in played or any(match not in played for _, match in inputs):
+                continue
+            after = {slot for slot in pending if slot not in inputs or users[slot] - played - {m}}
+            after.update(slot for slot in (("W", m), ("L", m)) if slot in users)
+            if best is None or len(after) < len(best[1]):
+                best = (m, after)
+        m, pending = best
+        played.add(m)
+        order.append(m)
+    return order
+
+
+def exact_placements(bracket: Bracket, odds) -> Dict[str, Dict[str, float]]:
+    """Exact probability of each finishing place for every team.
+
+    Single-elimination brackets are solved by propagation, which handles
+    64 teams easily. Other brackets are solved by a dynamic program whose
+    state is the team in every slot a later match or place still needs;
+    outcomes that leave the same teams in those slots are merged. That
+    covers GSL groups and double elimination up to 16 teams. Larger
+    double-elimination brackets would need more than MAX_EXACT_STATES
+    states and raise ValueError; use sample_bracket for them.
+    """
+    if bracket.single_elimination:
+        return _propagate(bracket, odds)
+
+    order = _state_order(bracket)
+    # Step after which each winner/loser slot is no longer needed
+    last_use = {}
+    for step, m in enumerate(order):
+        for slot in bracket.matches[m][:2]:
+            if not isinstance(slot, int):
+                last_use[slot] = step
+    for slot in bracket.places.values():
+        if not isinstance(slot, int):
+            last_use[slot] = len(order)
+
+    table = _odds_table(bracket.teams, odds, bracket.series_types())
+    live = []  # Slots held in each state, in state order
+    states = {(): 1.0}
+    for step, m in enumerate(order):
+        slot1, slot2, series_type = bracket.matches[m]
+        index1 = None if isinstance(slot1, int) else live.index(slot1)
+        index2 = None if isinstance(slot2, int) else live.index(slot2)
+        keep = [i for i, slot in enumerate(live) if last_use[slot] > step]
+        new_slots = [slot for slot in (("W", m), ("L", m)) if slot in last_use]
+        probabilities = table[series_type]
+        next_states = {}
+        for state, prob in states.items():
+            team1 = slot1 if index1 is None else state[index1]
+            team2 = slot2 if index2 is None else state[index2]
+            p = probabilities[team1][team2]
+            kept = tuple(state[i] for i in keep)
+            for winner, loser, q in ((team1, team2, p), (team2, team1, 1 - p)):
+                if q > 0:
+                    key = kept + tuple(winner if kind == "W" else loser for kind, _ in new_slots)
+                    next_states[key] = next_states.get(key, 0.0) + prob * q
+        if len(next_states) > MAX_EXACT_STATES:
+            raise ValueError("Bracket too large for exact placements, use sample_bracket")
+        states = next_states
+        live = [live[i] for i in keep] + new_slots
+
+    report = {name: dict.fromkeys(bracket.places, 0.0) for name in bracket.teams}
+    for state, prob in states.items():
+        for label, slot in bracket.places.items():
+            team = slot if isinstance(slot, int) else state[live.index(slot)]
+            report[bracket.teams[team]][label] += prob
+    return report
+
+
+def run_bracket_chunk(bracket: Bracket, table, seed: int, chunk_index: int, count: int) -> Dict:
+    """Sample one chunk of bracket runs"""
+    draw = chunk_rng(seed, chunk_index).random
+
+    def decide(team1, team2, series_type):
+        return draw() < table[series_type][team1][team2]
+
+    size = len(bracket.teams)
+    places = {label: [0] * size for label in bracket.places}
+    series_played = [0] * size
+    finals = Counter()
+    final = len(bracket.matches) - 1
+    for _ in range(count):
+        winners, losers = bracket.play(decide)
+        for label, slot in bracket.places.items():
+            places[label][_resolve(slot, winners, losers)] += 1
+        for winner, loser in zip(winners, losers):
+            series_played[winner] += 1
+            series_played[loser] += 1
+        finals[(winners[final], losers[final])] += 1
+    return {"places": places, "series_played": series_played, "finals": finals}
+
+
+def sample_bracket(bracket: Bracket, odds, n: int = 10000, seed: int = 0,
+                   workers: Optional[int] = None) -> Dict:
+    """Play a bracket n times from pairwise odds.
+
+    Returns per-team place probabilities and expected series played, plus the
+    distribution of final match-ups as {(winner, loser): probability}.
+    """
+    table = _odds_table(bracket.teams, odds, bracket.series_types())
+    chunks = _chunks(run_bracket_chunk, lambda index, count: (bracket, table, seed, index, count), n, workers)
+
+    finals = Counter()
+    for chunk in chunks:
+        finals.update(chunk["finals"])
+    teams = {}
+    for i, name in enumerate(bracket.teams):
+        row = {label: sum(c["places"][label][i] for c in chunks) / n for label in bracket.places}
+        row["series_played"] = sum(c["series_played"][i] for c in chunks) / n
+        teams[name] = row
+    return {
+        "teams": teams,
+        "finals": {(bracket.teams[w], bracket.teams[l]): count / n for (w, l), count in finals.most_common()}
+    }
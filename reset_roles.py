@@ -19,35 +19,10 @@ def reset_roles():
         conn = db.get_connection()
         cursor = conn.cursor()
 
-        # Clear existing role assignments
-        print("Clearing existing role assignments...")
-        cursor.execute('UPDATE players SET role_id = NULL')
-
-        # Re-run the migration logic
+        # Reassign every player's role in one pass (same logic as the migration)
         print("Reassigning roles with realistic distribution...")
-
-        # Get all players without roles
-        cursor.execute('SELECT id, name FROM players WHERE role_id IS NULL')
-        players_to_update = cursor.fetchall()
-
-        # Get team counts
-        cursor.execute('SELECT team_id, COUNT(*) as player_count FROM players WHERE role_id IS NULL GROUP BY team_id')
-        team_counts = dict(cursor.fetchall())
-
-        # Assign roles using the new algorithm
-        role_assignments = db.assign_realistic_roles(players_to_update, team_counts)
-
-        # Update the database
-        for player_id, player_name in players_to_update:
-            role_name = role_assignments.get(player_id, "Rifler")
-            cursor.execute('SELECT id FROM roles WHERE name = ?', (role_name,))
-            role_row = cursor.fetchone()
-            role_id = role_row[0] if role_row else 2  # Default to Rifler
-
-            cursor.execute('UPDATE players SET role_id = ? WHERE id = ?', (role_id, player_id))
-
-        conn.commit()
-        print(f"Successfully reassigned roles to {len(players_to_update)} players")
+        updated = db.reassign_player_roles()
+        print(f"Successfully reassigned roles to {updated} players")
 
         # Show new distribution
         cursor.execute('''
@@ -71,12 +46,8 @@ def reset_roles():
         print(f"\nTotal players: {total_players}")
 
     except Exception as e:
+        # reassign_player_roles rolls back its own transaction on failure
         print(f"Error resetting roles: {e}")
-        if 'conn' in locals():
-            conn.rollback()
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 if __name__ == "__main__":
     reset_roles()
\ No newline at end of file
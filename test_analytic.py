@@ -0,0 +1,32 @@
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cs2_analytic import (round_win_probability, map_score_distribution, map_win_probability,
+                          series_win_probability, matchup_odds)
+from cs2_batch import simulate_matches_batch
+
+
+def test_even_teams_are_coin_flips():
+    p_round = round_win_probability(80, 80)
+    assert abs(p_round - 0.5) < 1e-12
+    assert abs(map_win_probability(p_round) - 0.5) < 1e-12
+    assert abs(series_win_probability(0.5, "BO5") - 0.5) < 1e-12
+
+
+def test_score_distribution_is_complete():
+    distribution = map_score_distribution(0.55)
+    assert abs(sum(distribution.values()) - 1) < 1e-12
+    # Overtime scores and the coin-flip tie at 40 rounds are both reachable
+    assert distribution[(True, 16, 14, 1)] > 0
+    assert distribution[(True, 20, 20, 3)] == distribution[(False, 20, 20, 3)]
+
+
+def test_exact_odds_match_sampling(make_team):
+    team1, team2 = make_team("Vitality"), make_team("G2")
+    odds = matchup_odds(team1, team2)
+    sampled = simulate_matches_batch(team1, team2, 200000, seed=11).team1_win_rate()
+    assert abs(odds["map"] - sampled) < 0.005
+    assert odds["BO5"] > odds["BO3"] > odds["BO1"] > 0.5
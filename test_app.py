@@ -4,7 +4,7 @@ import os
 # Add the current directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from cs2_simulator import load_teams_from_json, Team, Player, simulate_series
+from cs2_simulator import load_teams_from_json, Team, Player, play_series
 
 def test_simulation():
     # Load teams
@@ -24,11 +24,43 @@ def test_simulation():
 
     # Simulate a BO1
     print("Testing simulation...")
-    winner, loser, team1_wins, team2_wins, map_results, all_rounds, overtime_levels = simulate_series(team1, team2, "BO1")
+    result = play_series(team1, team2, "BO1")
 
-    print(f"Winner: {winner}")
-    print(f"Score: {team1_wins} - {team2_wins}")
+    print(f"Winner: {result.winner}")
+    print(f"Score: {result.team1_wins} - {result.team2_wins}")
     print("Test completed successfully!")
 
+def test_quiet_result_renders_same_text_as_printed_output():
+    import io
+    import random
+    from contextlib import redirect_stdout
+    from cs2_simulator import simulate_series, print_player_stats
+
+    teams_dict = load_teams_from_json()
+    make_teams = lambda: (Team("Vitality", [Player(p["name"], p["rating"]) for p in teams_dict["Vitality"]]),
+                          Team("G2", [Player(p["name"], p["rating"]) for p in teams_dict["G2"]]))
+
+    team1, team2 = make_teams()
+    f = io.StringIO()
+    with redirect_stdout(f):
+        winner, loser, team1_wins, team2_wins, map_results, all_rounds, overtime_levels, _ = \
+            simulate_series(team1, team2, "BO5", rng=random.Random(9))
+        print("\n=== SERIES RESULTS ===")
+        print(f"{winner} wins the BO5 series {team1_wins} - {team2_wins}")
+        print("\nMap results:")
+        for line in map_results:
+            print(line)
+        print_player_stats(team1)
+        print_player_stats(team2)
+
+    team1, team2 = make_teams()
+    quiet = io.StringIO()
+    with redirect_stdout(quiet):
+        result = play_series(team1, team2, "BO5", rng=random.Random(9))
+    assert quiet.getvalue() == ""
+    assert result.render() == f.getvalue()
+    assert result.all_rounds == all_rounds
+    assert len(result.maps[0].round_winners) == result.maps[0].score1 + result.maps[0].score2
+
 if __name__ == "__main__":
     test_simulation()
\ No newline at end of file
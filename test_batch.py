@@ -0,0 +1,60 @@
+import sys
+import os
+import random
+from array import array
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cs2_simulator import AliasSampler, Team, Player
+from cs2_batch import simulate_matches_batch
+
+
+def test_batch_scores_follow_match_rules(make_team):
+    result = simulate_matches_batch(make_team("Vitality"), make_team("G2"), 5000, seed=7)
+
+    for s1, s2, won, ot in zip(result.score1.tolist(), result.score2.tolist(),
+                               result.team1_won.tolist(), result.overtime_levels.tolist()):
+        w_score, l_score = (s1, s2) if won else (s2, s1)
+        if ot == 0:
+            assert w_score == 13 and l_score <= 11
+        elif w_score + l_score < 40:
+            # Overtime N is won by reaching 13 + 3N with a margin of N + 1
+            assert w_score >= 13 + 3 * ot and w_score - l_score >= ot + 1
+        else:
+            assert w_score >= l_score
+
+    rounds = result.score1 + result.score2
+    assert (result.team1_kills.sum(axis=1) == result.team2_deaths.sum(axis=1)).all()
+    assert (result.team1_kills.sum(axis=1) >= 4 * result.score1).all()
+    assert (rounds <= 40).all()
+
+
+def test_batch_is_reproducible_for_a_seed(make_team):
+    team1, team2 = make_team("Vitality"), make_team("FaZe")
+    first = simulate_matches_batch(team1, team2, 1000, seed=42)
+    second = simulate_matches_batch(team1, team2, 1000, seed=42)
+    assert (first.score1 == second.score1).all()
+    assert (first.team2_assists == second.team2_assists).all()
+
+
+def test_unseeded_batch_records_its_seed(make_team):
+    team1, team2 = make_team("Vitality"), make_team("FaZe")
+    first = simulate_matches_batch(team1, team2, 500)
+    replay = simulate_matches_batch(team1, team2, 500, seed=first.seed)
+    assert first.roster_hash == replay.roster_hash
+    assert (first.score1 == replay.score1).all() and (first.team1_kills == replay.team1_kills).all()
+
+
+def test_alias_sampler_matches_weights_and_tracks_rating_changes():
+    weights = [90, 70, 60, 40, 10]
+    counts = array("l", [0] * 5)
+    AliasSampler(range(5), weights).add_events(counts, random.Random(4), 200000)
+    for count, weight in zip(counts, weights):
+        assert abs(count / 200000 - weight / sum(weights)) < 0.005
+
+    team = Team("Vitality", [Player("a", 80), Player("b", 80)])
+    kill_sampler = team.state.samplers()[0]
+    assert team.state.samplers()[0] is kill_sampler
+    team.players[0].rating = 90
+    assert team.state.samplers()[0] is not kill_sampler
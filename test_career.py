@@ -0,0 +1,96 @@
+import sys
+import os
+import random
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from career_system import Career, CareerManager, CareerPlayer
+
+
+def test_table_leveling_matches_level_by_level_loop():
+    rng = random.Random(11)
+    for _ in range(50):
+        rating = rng.randint(40, 99)
+        fast, slow = CareerPlayer("fast", rating), CareerPlayer("slow", rating)
+        for _ in range(rng.randint(1, 30)):
+            kills, deaths, assists, won = rng.randint(0, 40), rng.randint(0, 40), rng.randint(0, 10), rng.random() < 0.5
+            for player in (fast, slow):
+                player.matches_played += 1
+                player.wins += won
+                player.total_kills += kills
+                player.total_deaths += deaths
+                player.total_assists += assists
+            amount = rng.choice([10, 150, 900, 20000])
+            fast.add_experience(amount)
+            slow.experience += amount
+            while slow.experience >= slow.experience_to_next:
+                slow.level_up()
+            assert ({k: v for k, v in fast.to_dict().items() if k not in ("name", "created_date")} ==
+                    {k: v for k, v in slow.to_dict().items() if k not in ("name", "created_date")})
+
+
+def test_achievement_rules_come_from_the_database_and_unlocks_are_appended(tmp_path):
+    manager = CareerManager(str(tmp_path / "career.db"))
+    conn = manager.db.get_connection()
+    conn.execute('''INSERT INTO achievements (name, description, icon, stat, threshold)
+                    VALUES ('Playmaker', 'Get 100 assists', '', 'total_assists', 100)''')
+    conn.commit()
+
+    career = Career("rookie")
+    assert manager.save_career(career)
+    for _ in range(10):
+        assert manager.record_match(career, "G2", True, {"kills": 1, "deaths": 5, "assists": 10})
+    assert career.player.achievements == ["Rising Star", "Winner", "Veteran", "Playmaker", "Unstoppable"]
+    unlocks = conn.execute('SELECT rowid, achievement_id, unlocked_date FROM career_player_achievements').fetchall()
+
+    assert manager.record_match(career, "G2", False, {"kills": 60, "deaths": 1, "assists": 0})
+    rows = conn.execute('SELECT rowid, achievement_id, unlocked_date FROM career_player_achievements').fetchall()
+    assert rows[:len(unlocks)] == unlocks and len(rows) == len(unlocks) + 1
+    assert manager.load_career("rookie").player.achievements == career.player.achievements[:5] + ["Killer"]
+
+
+def test_career_is_rebuilt_from_snapshots_and_event_log(tmp_path):
+    manager = CareerManager(str(tmp_path / "career.db"))
+    conn = manager.db.get_connection()
+    rng = random.Random(5)
+    career = Career("rookie")
+    assert manager.save_career(career)
+    states = {}
+    for i in range(120):
+        if i == 60:
+            career.transfer(4)
+        stats = {"kills": rng.randint(0, 30), "deaths": rng.randint(0, 30), "assists": rng.randint(0, 8)}
+        assert manager.record_match(career, "G2", rng.random() < 0.6, stats)
+        seq = conn.execute('SELECT MAX(seq) FROM career_events').fetchone()[0]
+        states[seq] = career.snapshot()
+
+    events = manager.get_career_events("rookie", limit=10000)
+    assert [e["seq"] for e in events] == list(range(1, len(events) + 1))
+    assert sum(e["type"] == "match_played" for e in events) == 120
+    assert {"xp_granted", "level_up", "achievement_unlocked", "transfer"} <= {e["type"] for e in events}
+    snapshots = conn.execute('SELECT seq FROM career_snapshots ORDER BY seq').fetchall()
+    assert snapshots[0] == (0,) and len(snapshots) <= len(events) // 100 + 2
+
+    assert manager.load_career("rookie").snapshot() == career.snapshot()
+    for seq in list(states)[::17]:
+        assert manager.load_career_at("rookie", seq).snapshot() == states[seq]
+
+    # A rebuilt career keeps playing where it left off
+    loaded = manager.load_career("rookie")
+    assert manager.record_match(loaded, "NaVi", True, {"kills": 20, "deaths": 10, "assists": 2})
+    assert manager.load_career("rookie").snapshot() == loaded.snapshot()
+
+
+def test_edits_saved_along_with_events_survive_the_rebuild(tmp_path):
+    manager = CareerManager(str(tmp_path / "career.db"))
+    career = Career("rookie")
+    assert manager.save_career(career)
+    career.tournaments_won += 1
+    career.player.current_rating += 3
+    assert manager.record_match(career, "G2", True, {"kills": 10, "deaths": 5, "assists": 2})
+
+    loaded = manager.load_career("rookie")
+    assert loaded.tournaments_won == 1
+    assert loaded.player.current_rating == career.player.current_rating
+    assert loaded.snapshot() == career.snapshot()
@@ -0,0 +1,311 @@
+import sys
+import os
+import json
+import sqlite3
+
+import pytest
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cs2_database import CS2Database, connection_pool
+
+
+def test_connections_are_pooled_in_wal_mode(tmp_path):
+    db = CS2Database(str(tmp_path / "pool.db"))
+    conn = db.get_connection()
+    assert db.get_connection() is conn
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    # Callers closing the connection don't break later calls
+    conn.close()
+    db.save_setting("theme", "dark")
+    assert CS2Database(db.db_path).load_setting("theme") == "dark"
+
+    db.backup_database(str(tmp_path / "backup.db"))
+    assert CS2Database(str(tmp_path / "backup.db")).load_setting("theme") == "dark"
+
+    connection_pool.release(db.db_path)
+    assert db.get_connection() is not conn
+
+
+def test_team_import_is_skipped_or_diffed(tmp_path, capsys):
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "teams.json")) as f:
+        data = json.load(f)
+    json_file = str(tmp_path / "teams.json")
+    with open(json_file, "w") as f:
+        json.dump(data, f)
+
+    db = CS2Database(str(tmp_path / "import.db"))
+    db.load_teams_from_json(json_file)
+    ids = dict(db.get_connection().execute('SELECT name, id FROM players').fetchall())
+    capsys.readouterr()
+    db.load_teams_from_json(json_file)
+    assert capsys.readouterr().out == ""
+
+    vitality = data["teams"]["Vitality"]
+    vitality[0]["rating"] += 1
+    vitality[1] = {"name": "newcomer", "rating": 70}
+    with open(json_file, "w") as f:
+        json.dump(data, f)
+    db.load_teams_from_json(json_file)
+    assert "1 added, 1 updated, 1 removed" in capsys.readouterr().out
+
+    rows = dict(db.get_connection().execute('SELECT name, id FROM players').fetchall())
+    assert "ZywOo" not in rows and "newcomer" in rows
+    assert rows["apEX"] == ids["apEX"]
+    assert [p["rating"] for p in db.get_teams_dict()["Vitality"] if p["name"] == "apEX"] == [vitality[0]["rating"]]
+
+
+def test_legacy_database_is_migrated_once(tmp_path, capsys):
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        CREATE TABLE teams (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE NOT NULL);
+        CREATE TABLE players (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                              rating INTEGER NOT NULL, team_id INTEGER, is_career_player BOOLEAN DEFAULT FALSE);
+        INSERT INTO teams (name) VALUES ('Vitality');
+        INSERT INTO players (name, rating, team_id) VALUES ('apEX', 78, 1), ('ZywOo', 93, 1);
+    ''')
+    conn.commit()
+    conn.close()
+
+    db = CS2Database(db_path)
+    roles = dict(db.get_connection().execute(
+        'SELECT p.name, r.name FROM players p JOIN roles r ON r.id = p.role_id').fetchall())
+    assert roles == {"apEX": "IGL", "ZywOo": "AWPer"}
+    version = db.get_connection().execute('PRAGMA user_version').fetchone()[0]
+    assert version == db._migrations()[-1][0]
+
+    capsys.readouterr()
+    CS2Database(db_path)
+    assert capsys.readouterr().out == ""
+
+
+def test_role_reassignment_is_seeded_and_balanced(tmp_path):
+    db = CS2Database(str(tmp_path / "roles.db"))
+    db.load_teams_from_json(os.path.join(os.path.dirname(os.path.abspath(__file__)), "teams.json"))
+    query = 'SELECT p.id, r.name FROM players p JOIN roles r ON r.id = p.role_id ORDER BY p.id'
+
+    assert db.reassign_player_roles(seed=3) == 194
+    first = db.get_connection().execute(query).fetchall()
+    db.reassign_player_roles(seed=3)
+    assert db.get_connection().execute(query).fetchall() == first
+    # Each team gets at most one IGL
+    igls = db.get_connection().execute('''
+        SELECT MAX(n) FROM (SELECT COUNT(*) AS n FROM players p JOIN roles r ON r.id = p.role_id
+                            WHERE r.name = 'IGL' GROUP BY p.team_id)
+    ''').fetchone()[0]
+    assert igls == 1
+
+
+def test_career_match_is_one_atomic_unit(tmp_path):
+    from career_system import Career, CareerManager
+
+    manager = CareerManager(str(tmp_path / "career.db"))
+    career = Career("rookie")
+    assert manager.save_career(career)
+    player_id = manager.db.get_connection().execute('SELECT id FROM career_players').fetchone()[0]
+
+    for _ in range(12):
+        assert manager.record_match(career, "G2", True, {"kills": 20, "deaths": 10, "assists": 4})
+    loaded = manager.load_career("rookie")
+    assert loaded.total_matches == 12 and loaded.player.total_kills == 240
+    assert loaded.player.achievements == career.player.achievements
+    assert "Veteran" in career.player.achievements
+    assert manager.db.get_connection().execute('SELECT id FROM career_players').fetchone()[0] == player_id
+
+    # A failing insert (opponent_team is NOT NULL) leaves the saved career untouched
+    assert not manager.record_match(career, None, True, {"kills": 1})
+    assert manager.load_career("rookie").total_matches == 12
+    assert len(manager.get_career_match_history("rookie")) == 12
+
+
+def test_match_history_pages_with_keyset_cursor(tmp_path):
+    db = CS2Database(str(tmp_path / "history.db"))
+    for i in range(25):
+        db.add_career_match(1, "G2" if i % 3 else "FaZe", i % 2 == 0, i, 10, 2)
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = db.get_career_match_page(1, after=cursor, page_size=10)
+        pages.append(page)
+        if cursor is None:
+            break
+    ids = [m["id"] for page in pages for m in page]
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert ids == sorted(ids, reverse=True) and len(set(ids)) == 25
+
+    faze_wins = db.get_career_match_page(1, page_size=100, opponent="FaZe", won=True)[0]
+    assert all(m["opponent"] == "FaZe" and m["won"] for m in faze_wins)
+    assert db.count_career_matches(1, opponent="FaZe", won=True)["matches"] == len(faze_wins)
+    assert db.count_career_matches(1) == {"matches": 25, "wins": 13, "losses": 12}
+
+
+def test_box_score_is_stored_compactly_and_loaded_on_demand(tmp_path):
+    import random
+    from career_system import Career, CareerManager
+    from cs2_simulator import Team, load_teams_from_json, play_series
+
+    teams = load_teams_from_json(os.path.join(os.path.dirname(os.path.abspath(__file__)), "teams.json"))
+    result = play_series(Team.from_roster("G2", [(p["name"], p["rating"]) for p in teams["G2"]]),
+                         Team.from_roster("FaZe", [(p["name"], p["rating"]) for p in teams["FaZe"]]),
+                         "BO3", rng=random.Random(5))
+
+    manager = CareerManager(str(tmp_path / "career.db"))
+    career = Career("rookie")
+    assert manager.record_match(career, "FaZe", True, {"kills": 20, "deaths": 10, "assists": 4}, result)
+    assert manager.record_match(career, "G2", False, {"kills": 5, "deaths": 15, "assists": 1})
+
+    newest, oldest = manager.get_career_match_history("rookie")
+    assert manager.get_match_box_score(newest["id"]) is None
+    loaded = manager.get_match_box_score(oldest["id"])
+    assert loaded.render() == result.render()
+    blob = manager.db.get_connection().execute('SELECT data FROM career_match_box_scores').fetchone()[0]
+    assert len(blob) < 100
+
+
+def test_seeded_match_is_replayed_from_its_seed(tmp_path):
+    from career_system import Career, CareerManager
+    from cs2_simulator import Team, load_teams_from_json, new_seed, play_series
+
+    teams = load_teams_from_json(os.path.join(os.path.dirname(os.path.abspath(__file__)), "teams.json"))
+    lineups = [Team.from_roster(name, [(p["name"], p["rating"]) for p in teams[name]]) for name in ("G2", "FaZe")]
+    result = play_series(lineups[0], lineups[1], "BO3", seed=new_seed())
+
+    manager = CareerManager(str(tmp_path / "career.db"))
+    assert manager.record_match(Career("rookie"), "FaZe", True, {"kills": 20, "deaths": 10, "assists": 4}, result)
+    conn = manager.db.get_connection()
+    match_id = conn.execute('SELECT id FROM career_matches').fetchone()[0]
+    assert conn.execute('SELECT COUNT(*) FROM career_match_box_scores').fetchone()[0] == 0
+
+    assert manager.db.replay_match(match_id).render() == result.render()
+    assert manager.get_match_box_score(match_id).render() == result.render()
+
+    conn.execute('UPDATE career_matches SET engine_version = engine_version + 1')
+    conn.commit()
+    with pytest.raises(ValueError):
+        manager.db.replay_match(match_id)
+
+
+def test_online_backup_runs_in_background_with_retention(tmp_path):
+    from cs2_backup import BackupScheduler
+
+    db = CS2Database(str(tmp_path / "live.db"))
+    for i in range(200):
+        db.save_setting(f"key{i}", "x" * 2000)
+
+    steps = []
+    job = db.backup_database(str(tmp_path / "hot.db"), pages=10, progress=lambda done, total: steps.append(done),
+                             background=True)
+    db.save_setting("written during backup", "yes")
+    job.wait(30)
+    assert len(steps) > 1 and steps == sorted(steps)
+    backup = sqlite3.connect(str(tmp_path / "hot.db"))
+    assert backup.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+    assert backup.execute("SELECT COUNT(*) FROM settings WHERE key LIKE 'key%'").fetchone()[0] == 200
+    backup.close()
+
+    scheduler = BackupScheduler(db.db_path, str(tmp_path / "rolling"), interval=3600, keep=2)
+    paths = [scheduler.run_once() for _ in range(3)]
+    assert scheduler.backups() == paths[1:]
+    scheduler = BackupScheduler(db.db_path, str(tmp_path / "latest"), interval=3600, keep=1)
+    paths = [scheduler.run_once() for _ in range(2)]
+    assert scheduler.backups() == paths[1:]
+    with pytest.raises(ValueError):
+        BackupScheduler(db.db_path, str(tmp_path / "none"), interval=3600, keep=0)
+
+
+def test_career_save_slot_overlays_the_base_database(tmp_path):
+    from career_db_utils import create_career_database, list_career_databases, open_career_database
+    from career_system import Career
+
+    base_path = str(tmp_path / "base.db")
+    base = CS2Database(base_path)
+    base.load_teams_from_json(os.path.join(os.path.dirname(os.path.abspath(__file__)), "teams.json"))
+    create_career_database("Pro One", base_path, str(tmp_path))
+    create_career_database("Pro Two", base_path, str(tmp_path))
+    slot = open_career_database("Pro One", base_path, str(tmp_path))
+    slot.save_career(Career("Pro One"))
+    # Only the slot has overlay tables
+    overlay_tables = "SELECT name FROM main.sqlite_master WHERE name LIKE 'slot%' ORDER BY name"
+    assert slot.get_connection().execute(overlay_tables).fetchall() == [("slot_players",), ("slot_removed_players",)]
+    assert base.get_connection().execute(overlay_tables).fetchall() == []
+    assert list_career_databases(str(tmp_path)) == [("Pro One", str(tmp_path / "career_Pro_One.db")),
+                                                    ("Pro Two", str(tmp_path / "career_Pro_Two.db"))]
+    assert slot.get_teams_dict() == base.get_teams_dict()
+    assert slot.replace_player_with_role_in_team(1, "IGL", "Pro One", 60)
+    team = [name for name, _ in slot.get_team_rosters()["Vitality"]]
+    assert "Pro One" in team and "apEX" not in team
+    assert "apEX" in [p["name"] for p in base.get_teams_dict()["Vitality"]]
+    assert "apEX" in [p["name"] for p in open_career_database("Pro Two", base_path, str(tmp_path)).get_teams_dict()["Vitality"]]
+    with pytest.raises(sqlite3.OperationalError):
+        slot.get_connection().execute("UPDATE teams SET name = 'renamed'")
+    # Reopening on the same thread, whose pooled connection has the base attached, is still a slot
+    assert open_career_database("Pro One", base_path, str(tmp_path)).base_db_path == base_path
+
+    # Reopening the slot on a fresh connection sees the same overlay
+    connection_pool.release(slot.db_path)
+    team = [name for name, _ in open_career_database("Pro One", base_path, str(tmp_path)).get_team_rosters()["Vitality"]]
+    assert "Pro One" in team and "apEX" not in team
+
+    # Players added to the base after the slot was created don't collide with slot rows
+    base.get_connection().execute("INSERT INTO players (name, rating, team_id) VALUES ('newcomer', 70, 1)")
+    base.get_connection().commit()
+    team = [name for name, _ in open_career_database("Pro One", base_path, str(tmp_path)).get_team_rosters()["Vitality"]]
+    assert "Pro One" in team and "newcomer" in team
+
+
+def test_career_fast_forward_runs_in_memory_and_saves_in_batches(tmp_path):
+    from career_system import Career, CareerManager
+
+    results = []
+    for run in ("a", "b"):
+        db_path = str(tmp_path / f"{run}.db")
+        CS2Database(db_path).load_teams_from_json(os.path.join(os.path.dirname(os.path.abspath(__file__)), "teams.json"))
+        manager = CareerManager(db_path)
+        assert manager.save_career(Career("rookie", team_id=1))
+        summary = manager.fast_forward("rookie", n_matches=300, seed=3, checkpoint_every=128)
+        results.append((summary["wins"], summary["career"].player.level, summary["career"].player.experience))
+        assert manager.count_career_matches("rookie")["matches"] == 300
+        assert manager.load_career("rookie").player.to_dict() == summary["career"].player.to_dict()
+    assert results[0] == results[1]
+
+    summary = manager.fast_forward("rookie", until_level=results[0][1] + 2, seed=4)
+    assert summary["career"].player.level == results[0][1] + 2
+    summary = manager.fast_forward("rookie", season=["G2", ("FaZe", "BO3")], seed=5)
+    history = manager.get_career_match_history("rookie", limit=2)
+    assert summary["matches"] == 2 and [m["opponent"] for m in history] == ["FaZe", "G2"]
+    assert manager.get_match_box_score(history[0]["id"]).series_type == "BO3"
+
+
+def test_career_saves_write_only_changed_columns(tmp_path):
+    from career_system import Career, CareerManager
+
+    manager = CareerManager(str(tmp_path / "career.db"))
+    career = Career("rookie")
+    assert manager.save_career(career)
+    conn = manager.db.get_connection()
+    ids = conn.execute('SELECT c.id, p.id FROM careers c JOIN career_players p ON p.id = c.career_player_id').fetchall()
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        career = manager.load_career("rookie")
+        del statements[:]
+        assert manager.save_career(career)
+        assert not [sql for sql in statements if "UPDATE" in sql or "INSERT" in sql]
+
+        career.transfer(7)
+        del statements[:]
+        assert manager.save_career(career)
+        writes = [" ".join(sql.split()) for sql in statements
+                  if ("UPDATE" in sql or "INSERT" in sql) and "career_events" not in sql]
+        assert writes == ["UPDATE career_players SET team_id = 7 WHERE id = %d" % ids[0][1]]
+    finally:
+        conn.set_trace_callback(None)
+
+    # A fresh object for an existing career is upserted onto the same rows
+    assert manager.save_career(Career("rookie", team_id=3))
+    assert conn.execute('SELECT c.id, p.id FROM careers c JOIN career_players p ON p.id = c.career_player_id').fetchall() == ids
+    assert manager.load_career("rookie").player.team_id == 3
@@ -0,0 +1,28 @@
+import sys
+import os
+import sqlite3
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cs2_database import CS2Database
+from cs2_matchups import MatchupMatrix
+
+
+def test_only_changed_rosters_are_recomputed(tmp_path):
+    db = CS2Database(str(tmp_path / "matchups.db"))
+    db.load_teams_from_json(os.path.join(os.path.dirname(os.path.abspath(__file__)), "teams.json"))
+    matrix = MatchupMatrix(db, workers=1)
+    teams = len(db.get_team_rosters())
+    assert matrix.refresh() == teams * (teams - 1) // 2
+    assert abs(matrix.probability("Vitality", "G2", "BO3") + matrix.probability("G2", "Vitality", "BO3") - 1) < 1e-12
+
+    # A fresh instance picks the matrix up from the disk cache
+    assert MatchupMatrix(db, workers=1).refresh() == 0
+
+    with sqlite3.connect(db.db_path) as conn:
+        team_id = conn.execute("SELECT id FROM teams WHERE name = 'G2'").fetchone()[0]
+    before = matrix.probability("Vitality", "G2")
+    db.replace_player_with_role_in_team(team_id, "AWPer", "Rookie", 40)
+    assert matrix.refresh() == teams - 1
+    assert matrix.probability("Vitality", "G2") > before
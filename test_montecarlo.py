@@ -0,0 +1,28 @@
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cs2_montecarlo import run_series_simulations, estimate_series_odds, wilson_interval
+
+
+def test_report_does_not_depend_on_worker_count(make_team):
+    team1, team2 = make_team("Vitality"), make_team("G2")
+    single = run_series_simulations(team1, team2, "BO3", 600, seed=3, workers=1)
+    pooled = run_series_simulations(team1, team2, "BO3", 600, seed=3, workers=2)
+    assert single == pooled
+    assert sum(single["score_histogram"].values()) == 600
+    # The caller's Player objects are never touched by the workers
+    assert all(p.kills == 0 for p in team1.players)
+
+
+def test_odds_estimate_stops_at_requested_precision(make_team):
+    team1, team2 = make_team("Vitality"), make_team("Imperium Esport")
+    odds = estimate_series_odds(team1, team2, "BO3", target_ci=0.02, seed=1)
+    assert odds["converged"]
+    assert odds["half_width"] <= 0.02
+    assert odds["ci_low"] <= odds["team1_win_rate"] <= odds["ci_high"]
+    assert odds["samples"] == odds["series"] < 5000
+    # A 50/50 matchup would need about 2400 series for the same precision
+    assert wilson_interval(1200, 2400)[1] - 0.5 <= 0.02
@@ -0,0 +1,59 @@
+import sys
+import os
+
+import pytest
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cs2_tournament import (simulate_swiss_stage, PairwiseOdds, bracket_order, single_elimination,
+                            double_elimination, exact_placements, sample_bracket)
+
+
+@pytest.fixture
+def swiss_teams(teams_dict, make_team):
+    return [make_team(name) for name in list(teams_dict)[:16]]
+
+
+def test_swiss_stage_totals_and_reproducibility(swiss_teams):
+    teams = swiss_teams
+    report = simulate_swiss_stage(teams, 2000, seed=5, workers=1)
+    assert report == simulate_swiss_stage(teams, 2000, seed=5, workers=2)
+    # Every stage sends 8 teams through, two of them 3-0, and knocks two out 0-3
+    assert abs(sum(r["advance"] for r in report.values()) - 8) < 1e-9
+    assert abs(sum(r["3-0"] for r in report.values()) - 2) < 1e-9
+    assert abs(sum(r["0-3"] for r in report.values()) - 2) < 1e-9
+    assert report["Vitality"]["advance"] > report["Legacy"]["advance"]
+
+    # The full play_series path follows the same format
+    full = simulate_swiss_stage(teams, 3, seed=5, workers=1, fast=False)
+    assert abs(sum(r["advance"] for r in full.values()) - 8) < 1e-9
+
+
+def test_exact_bracket_odds_match_sampling(swiss_teams):
+    teams = swiss_teams[:8]
+    odds = PairwiseOdds.from_teams(teams)
+    names = [teams[i].name for i in bracket_order(8)]
+    for bracket in (single_elimination(names, ["BO3", "BO3", "BO5"]), double_elimination(names)):
+        exact = exact_placements(bracket, odds)
+        sampled = sample_bracket(bracket, odds, 20000, seed=2, workers=1)
+        assert abs(sum(r["champion"] for r in exact.values()) - 1) < 1e-9
+        for name in names:
+            assert abs(exact[name]["champion"] - sampled["teams"][name]["champion"]) < 0.015
+            assert abs(exact[name]["runner-up"] - sampled["teams"][name]["runner-up"]) < 0.015
+
+
+def test_exact_double_elimination_scales_to_16_teams(swiss_teams, monkeypatch):
+    import cs2_tournament
+
+    odds = PairwiseOdds.from_teams(swiss_teams)
+    bracket = double_elimination([swiss_teams[i].name for i in bracket_order(16)])
+    exact = exact_placements(bracket, odds)
+    sampled = sample_bracket(bracket, odds, 20000, seed=3, workers=1)
+    assert abs(sum(r["champion"] for r in exact.values()) - 1) < 1e-9
+    for name, row in exact.items():
+        assert abs(row["champion"] - sampled["teams"][name]["champion"]) < 0.015
+
+    monkeypatch.setattr(cs2_tournament, "MAX_EXACT_STATES", 1000)
+    with pytest.raises(ValueError):
+        exact_placements(bracket, odds)